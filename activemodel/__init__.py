@@ -2,14 +2,24 @@
 from activemodel.types import typeid_patch  # noqa: F401
 
 from .base_model import BaseModel
-from .decorators import property_field
-from .session_manager import SessionManager, get_engine, get_session, init
+from .decorators import hook, property_field
+from .query_log import query_log
+from .session_manager import (
+    SessionManager,
+    get_engine,
+    get_session,
+    init,
+    transaction,
+)
 
 __all__ = [
     "BaseModel",
     "SessionManager",
+    "hook",
     "property_field",
+    "query_log",
     "get_engine",
     "get_session",
     "init",
+    "transaction",
 ]
@@ -1,24 +1,44 @@
+import itertools
 import json
+from functools import partial
 import typing as t
-from contextlib import nullcontext
+from inspect import signature
+from types import FunctionType
+from contextlib import ExitStack, nullcontext
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.exc import NoResultFound
 import sqlmodel as sm
 import uuid_utils
 from sqlalchemy.dialects.postgresql import insert as postgres_insert
-from sqlalchemy.orm import declared_attr
+from sqlalchemy.orm import declared_attr, make_transient_to_detached
+from sqlalchemy.orm.attributes import instance_state, set_committed_value
 from sqlalchemy.orm.attributes import flag_modified as sa_flag_modified
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import Column, Field, Session, SQLModel, inspect, select
+from sqlmodel.sql.expression import SelectOfScalar
 from typeid import TypeID
 
+from activemodel.mixins.cached import CachedModelMixin
 from activemodel.mixins.pydantic_json import PydanticJSONMixin
+from activemodel.types.typeid import TypeIDType
 
 # NOTE: this patches a core method in sqlmodel to support db comments
 from .patches import get_column_from_field_patch  # noqa: F401
-from .query_wrapper import QueryWrapper
+from .decorators import LIFECYCLE_HOOKS
+from .estimates import supports_estimates, table_row_estimate
+from .query_wrapper import QueryWrapper, SampleStrategy
 from .utils import to_snake_case
-from .session_manager import get_session
+from .session_manager import (
+    _commit_or_flush,
+    _has_uncommitted_flush,
+    _run_after_commit,
+    _run_in_async_session,
+    _transaction_callbacks,
+    get_session,
+)
 
 POSTGRES_INDEXES_NAMING_CONVENTION = {
     "ix": "%(column_0_label)s_idx",
@@ -38,6 +58,11 @@ foreign keys in a table. This naming convention is a workaround to fix this issu
 
 SQLModel.metadata.naming_convention = POSTGRES_INDEXES_NAMING_CONVENTION
 
+type CounterChange = t.Literal["create", "update", "delete"]
+
+_finder_statements: dict[tuple[type, str, tuple[str, ...]], t.Any] = {}
+"prebuilt statements for hot finders, keyed by model, finder kind and filtered field names"
+
 
 class BaseModel(SQLModel):
     """
@@ -56,12 +81,14 @@ class BaseModel(SQLModel):
 
         Create/Update: before_create, after_create, before_update, after_update, before_save, after_save, around_save
         Delete: before_delete, after_delete, around_delete
+        Create/Update/Delete: after_commit
         Read: after_find, after_initialize
 
     around_* hooks must be context managers (method returning a CM or a CM attribute).
     Ordering (create): before_create -> before_save -> (enter around_save) -> persist -> after_create -> after_save -> (exit around_save)
     Ordering (update): before_update -> before_save -> (enter around_save) -> persist -> after_update -> after_save -> (exit around_save)
     Delete: before_delete -> (enter around_delete) -> delete -> after_delete -> (exit around_delete)
+    after_commit runs last, or once the outermost `transaction()` block commits
     Read: finder/query method -> after_find -> after_initialize
     Construction: Model(...) -> after_initialize
 
@@ -72,6 +99,28 @@ class BaseModel(SQLModel):
 
     __table_args__ = None
 
+    # fetch server-generated values (`created_at`, `onupdate` timestamps, etc) with RETURNING as part of the
+    # INSERT/UPDATE so lean saves never need a follow-up SELECT. Models which define their own `__mapper_args__`
+    # should include this as well.
+    __mapper_args__ = {"eager_defaults": True}
+
+    __lean_save__: t.ClassVar[bool] = False
+    "model-level default for `save(lean=...)`"
+
+    __database__: t.ClassVar[str | None] = None
+    "name of the database (registered with `activemodel.init(url, name=...)`) this model lives in, default database if None"
+
+    __count_estimate_threshold__: t.ClassVar[int] = 100_000
+    "`count(estimate=True)` counts exactly when the estimate is below this, where an exact count is cheap"
+
+    __counter_caches__: t.ClassVar[
+        tuple[tuple[str, type["BaseModel"], str], ...] | None
+    ] = None
+    "(foreign key field, parent model, counter field) of every `foreign_key(counter_cache=...)`, see `_counter_caches`"
+
+    __lifecycle_hooks__: t.ClassVar[dict[str, tuple[t.Callable, ...]]] = {}
+    "compiled hook callbacks, see `_compile_lifecycle_hooks`"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._call_hook("after_initialize")
@@ -85,6 +134,51 @@ class BaseModel(SQLModel):
         cls.model_config["use_attribute_docstrings"] = True
 
         cls._apply_class_doc()
+        cls._compile_lifecycle_hooks()
+
+    @classmethod
+    def _compile_lifecycle_hooks(cls):
+        """
+        Resolve every lifecycle hook into a tuple of callbacks once, when the class is created.
+
+        The method named after the hook (resolved through the MRO, so overrides replace the parent's method) runs
+        first, then `@hook` callbacks from parent classes down to this one. Hooks without callbacks are left out, so
+        models without hooks skip them with a single dict lookup. Signatures are validated here instead of per call.
+        """
+
+        hooks: dict[str, list[t.Callable]] = {}
+
+        for hook_name in LIFECYCLE_HOOKS:
+            if callable(method := getattr(cls, hook_name, None)):
+                hooks[hook_name] = [method]
+
+        for klass in reversed(cls.__mro__):
+            for attr_name, value in vars(klass).items():
+                # skip decorated callbacks which a subclass has overridden
+                if (
+                    not isinstance(value, FunctionType)
+                    or getattr(cls, attr_name, None) is not value
+                ):
+                    continue
+
+                for hook_name in getattr(value, "__lifecycle_hooks__", ()):
+                    callbacks = hooks.setdefault(hook_name, [])
+
+                    if value not in callbacks:
+                        callbacks.append(value)
+
+        for hook_name, callbacks in hooks.items():
+            for callback in callbacks:
+                try:
+                    signature(callback).bind(None)
+                except TypeError:
+                    raise TypeError(
+                        f"Hook '{hook_name}' on {cls.__name__} must accept exactly 1 positional argument (self)"
+                    ) from None
+
+        cls.__lifecycle_hooks__ = {
+            hook_name: tuple(callbacks) for hook_name, callbacks in hooks.items()
+        }
 
     @classmethod
     def _apply_class_doc(cls):
@@ -130,7 +224,7 @@ class BaseModel(SQLModel):
         return to_snake_case(cls.__name__)
 
     @classmethod
-    def foreign_key(cls, **kwargs) -> t.Any:
+    def foreign_key(cls, *, counter_cache: str | None = None, **kwargs) -> t.Any:
         """
         Returns a `Field` object referencing the foreign key of the model.
 
@@ -138,9 +232,26 @@ class BaseModel(SQLModel):
 
         >>> other_model_id: TypeID = OtherModel.foreign_key()
         >>> other_model = Relationship()
+
+        Pass `counter_cache` with the name of an integer column on this model (defaulting to 0) to keep it equal to
+        the number of records pointing to it. It's updated in the same transaction whenever the session flushes a
+        record being created, deleted or moved to another parent (`save()`, `insert_all()`, `delete()`, autoflushes),
+        and by `find_or_create_by()` and `find_or_create_all()`. Set-based writes (`update_all()`, `delete_all()`,
+        `upsert()`, `upsert_all()`, `update_columns()`, raw SQL) don't update it, use `reset_counters()`.
         """
 
-        field_options = {"nullable": False} | kwargs
+        field_options: dict[str, t.Any] = {"nullable": False} | kwargs
+
+        if counter_cache is not None:
+            assert counter_cache in cls.model_fields, (
+                f"{cls.__name__} has no '{counter_cache}' field for the counter cache"
+            )
+
+            sa_column_kwargs = field_options.get("sa_column_kwargs", {})
+            field_options["sa_column_kwargs"] = sa_column_kwargs | {
+                "info": sa_column_kwargs.get("info", {})
+                | {"counter_cache": (cls, counter_cache)}
+            }
 
         return Field(
             # TODO id field is hard coded, should pick the PK field in case it's different
@@ -189,13 +300,196 @@ class BaseModel(SQLModel):
 
         with get_session() as session:
             result = session.exec(stmt)
-            session.commit()
+            _commit_or_flush(session)
 
             # TODO this is so ugly:
             result = result.one()[0]
 
+        cls._expire_cached([getattr(result, cls.primary_key_column().name)])
+
         return result
 
+    @classmethod
+    @t.overload
+    def upsert_all(
+        cls,
+        rows: t.Iterable[dict[str, t.Any]],
+        unique_by: str | list[str],
+        *,
+        update_columns: list[str] | None = None,
+        batch_size: int = 1_000,
+        ids_only: t.Literal[False] = False,
+    ) -> list[t.Self]: ...
+
+    @classmethod
+    @t.overload
+    def upsert_all(
+        cls,
+        rows: t.Iterable[dict[str, t.Any]],
+        unique_by: str | list[str],
+        *,
+        update_columns: list[str] | None = None,
+        batch_size: int = 1_000,
+        ids_only: t.Literal[True],
+    ) -> list[t.Any]: ...
+
+    @classmethod
+    def upsert_all(
+        cls,
+        rows: t.Iterable[dict[str, t.Any]],
+        unique_by: str | list[str],
+        *,
+        update_columns: list[str] | None = None,
+        batch_size: int = 1_000,
+        ids_only: bool = False,
+    ) -> list[t.Self] | list[t.Any]:
+        """
+        Multi-row version of `upsert()`. Each batch is sent as a single `INSERT ... ON CONFLICT DO UPDATE ... RETURNING`
+        statement and all batches are committed once at the end.
+
+        - `update_columns`: columns to overwrite with the incoming (`excluded.*`) values on conflict. Defaults to every
+          column passed in `rows` except the `unique_by` and primary key columns.
+        - `ids_only`: return primary keys instead of hydrating model instances.
+
+        Results are *not* guaranteed to be in the same order as `rows`: SQLAlchemy can only sort RETURNING rows by
+        parameter order when it can match them back to the inserted primary key, which ON CONFLICT breaks. Postgres
+        rejects a batch which contains the same `unique_by` values twice, so dedupe `rows` beforehand.
+
+        Column `onupdate` SQL expressions (e.g. `updated_at`) are not applied by Postgres on conflict, so they are
+        added to the update explicitly.
+        """
+
+        assert batch_size > 0, "batch_size must be greater than 0"
+
+        rows = list(rows)
+        if not rows:
+            return []
+
+        index_elements = [unique_by] if isinstance(unique_by, str) else unique_by
+        pk_column = cls.primary_key_column()
+
+        if update_columns is None:
+            update_columns = [
+                key
+                for key in dict.fromkeys(itertools.chain.from_iterable(rows))
+                if key not in index_elements and key != pk_column.name
+            ]
+
+        insert_stmt = postgres_insert(cls)
+        set_ = {column: insert_stmt.excluded[column] for column in update_columns}
+
+        for column in cls._table().columns:
+            if column.name in set_ or column.onupdate is None:
+                continue
+
+            # only SQL expressions (like `now()`) can be embedded in the conflict UPDATE
+            if column.onupdate.is_clause_element:
+                set_[column.name] = column.onupdate.arg  # type: ignore[attr-defined]
+
+        conflict_stmt = (
+            insert_stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            if set_
+            # nothing to update, but DO UPDATE is still required for RETURNING to include conflicting rows
+            else insert_stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={index_elements[0]: insert_stmt.excluded[index_elements[0]]},
+            )
+        )
+
+        returning_target = getattr(cls, pk_column.name) if ids_only else cls
+        stmt = conflict_stmt.returning(returning_target)
+
+        results = []
+
+        with get_session() as session:
+            for batch in itertools.batched(rows, batch_size):
+                # populate_existing updates instances already in the identity map with the upserted values
+                results.extend(
+                    session.scalars(
+                        stmt,
+                        list(batch),
+                        execution_options={"populate_existing": True},
+                    )
+                )
+
+            _commit_or_flush(session, preserve_loaded_state=True)
+
+        cls._expire_cached(
+            results
+            if ids_only
+            else [getattr(result, pk_column.name) for result in results]
+        )
+
+        return results
+
+    @classmethod
+    def insert_all(
+        cls,
+        rows: t.Iterable[t.Self | dict[str, t.Any]],
+        *,
+        batch_size: int = 1_000,
+    ) -> list[t.Self]:
+        """
+        Insert many new records at once, running the same create hooks as `save()` for every instance.
+
+        Each batch is flushed together, which lets SQLAlchemy emit a multi-row `INSERT ... RETURNING`
+        (insertmanyvalues) instead of one INSERT per instance. RETURNING populates server defaults such as
+        `created_at`, so unlike `save()` there is no per-instance refresh SELECT. Each batch is committed once.
+
+        Rows can be model instances or dicts of field values, which are passed to the model constructor.
+
+        >>> User.insert_all([{"email": "a@example.com"}, User(email="b@example.com")], batch_size=500)
+        """
+
+        assert batch_size > 0, "batch_size must be greater than 0"
+
+        instances = [cls(**row) if isinstance(row, dict) else row for row in rows]
+
+        for batch in itertools.batched(instances, batch_size):
+            cls._insert_batch(batch)
+
+        return instances
+
+    @classmethod
+    def _insert_batch(cls, batch: tuple[t.Self, ...]) -> None:
+        with get_session() as session:
+            for instance in batch:
+                if not instance.is_new():
+                    raise ValueError(
+                        "insert_all only accepts records which are not persisted"
+                    )
+
+                if (
+                    old_session := Session.object_session(instance)
+                ) and old_session is not session:
+                    old_session.expunge(instance)
+
+            session.add_all(batch)
+
+            # same ordering as `save()`: hooks run once the instance is attached to the session
+            for instance in batch:
+                instance._call_hook("before_create")
+                instance._call_hook("before_save")
+
+            with ExitStack() as around_save_stack:
+                for instance in batch:
+                    if cm := instance._get_around_context_manager("around_save"):
+                        around_save_stack.enter_context(cm)
+
+                # one flush for the whole batch is what allows SQLAlchemy to group the INSERTs
+                session.flush()
+                _commit_or_flush(session, preserve_loaded_state=True)
+
+            for instance in batch:
+                instance._call_hook("after_create")
+                instance._call_hook("after_save")
+
+                # snapshot JSON fields so in-place mutations are tracked on the next save
+                if isinstance(instance, PydanticJSONMixin):
+                    instance.__transform_dict_to_pydantic__()
+
+                instance._schedule_after_commit()
+
     def delete(self):
         """Delete instance running delete hooks and optional around_delete context manager."""
 
@@ -210,15 +504,44 @@ class BaseModel(SQLModel):
 
             self._call_hook("before_delete")
             with cm:
-                session.commit()
+                _commit_or_flush(session)
+            self._expire_cached([self._primary_key_value()])
             self._call_hook("after_delete")
+            self._schedule_after_commit()
 
         return True
 
-    def save(self):
-        """Persist instance running create/update hooks and optional around_save context manager."""
+    async def adelete(self):
+        "async version of `delete()`, the same hooks are run"
+        return await _run_in_async_session(self.delete)
+
+    def save(self, *, lean: bool | None = None):
+        """
+        Persist instance running create/update hooks and optional around_save context manager.
+
+        By default the instance is refreshed from the database after the commit. A lean save (`lean=True`, or set
+        `__lean_save__ = True` on the model to make it the default) avoids extra round trips:
+
+        - server-generated columns are populated by RETURNING instead of a refresh SELECT of the full row
+        - if the persisted instance has no changes (including in-place JSON mutations), nothing is sent to the
+          database and no hooks are run
+        """
+
+        if lean is None:
+            lean = self.__lean_save__
 
         is_new = self.is_new()
+
+        # an autoflush can send the changes before save() is called, which clears them from the instance but still
+        # leaves them to be committed
+        if (
+            lean
+            and not is_new
+            and not self._has_unsaved_changes()
+            and not _has_uncommitted_flush(Session.object_session(self))
+        ):
+            return self
+
         cm = self._get_around_context_manager("around_save") or nullcontext()
 
         with get_session() as session:
@@ -236,25 +559,281 @@ class BaseModel(SQLModel):
             self._call_hook("before_save")
 
             with cm:
-                session.commit()
-                session.refresh(self)
+                committed = _commit_or_flush(session, preserve_loaded_state=lean)
 
+                # a flush inside `transaction()` does not expire the instance, so there is nothing to refresh
+                if committed and not lean:
+                    session.refresh(self)
+
+            self._expire_cached([self._primary_key_value()])
             self._call_hook("after_create" if is_new else "after_update")
             self._call_hook("after_save")
 
             # Only call the transform method if the class is a subclass of PydanticJSONMixin
             if issubclass(self.__class__, PydanticJSONMixin):
                 self.__class__.__transform_dict_to_pydantic__(self)
+
+            self._schedule_after_commit()
+
         return self
 
-    def _call_hook(self, hook_name: str) -> None:
-        method = getattr(self, hook_name, None)
-        if callable(method):
-            if method.__code__.co_argcount != 1:
-                raise TypeError(
-                    f"Hook '{hook_name}' must accept exactly 1 positional argument (self)"
+    async def asave(self, *, lean: bool | None = None):
+        """
+        Async version of `save()` which runs on an `AsyncSession` without blocking the event loop.
+
+        The same hooks are run, and hooks can still lazy load relationships.
+        """
+        return await _run_in_async_session(partial(self.save, lean=lean))
+
+    def update_columns(self, *, returning: bool = False, **values: t.Any) -> t.Self:
+        """
+        Write columns straight to the database with a single `UPDATE ... WHERE id = ...`, skipping hooks, validation
+        and the refresh SELECT of `save()`.
+
+        >>> user.update_columns(last_seen_at=Instant.now())
+
+        The values are set on the instance as committed values, so they are not sent again by the next `save()`.
+        Other unsaved changes on the instance are left alone. Pass `returning=True` to read the written columns and
+        `onupdate` columns (e.g. `updated_at`) back from the database, which applies its type conversions (e.g.
+        timestamp precision). Counter caches are not updated.
+        """
+
+        if self.is_new():
+            raise ValueError("update_columns requires a persisted record, use save()")
+
+        self.__class__._update_columns_by_id(
+            self._primary_key_value(), values, returning=returning, instance=self
+        )
+
+        return self
+
+    async def aupdate_columns(self, *, returning: bool = False, **values: t.Any):
+        "async version of `update_columns()`"
+        return await _run_in_async_session(
+            partial(self.update_columns, returning=returning, **values)
+        )
+
+    @classmethod
+    def update_by_id(cls, id: t.Any, *, returning: bool = False, **values: t.Any):
+        """
+        Update columns of a record without loading it, with a single `UPDATE ... WHERE id = ...`. Hooks are skipped.
+
+        Returns True if the record exists. With `returning=True` the updated record is returned instead (None if it
+        does not exist), built from the `UPDATE ... RETURNING` row.
+
+        >>> User.update_by_id(user_id, active=False)
+        """
+
+        return cls._update_columns_by_id(id, values, returning=returning)
+
+    @classmethod
+    def _update_columns_by_id(
+        cls,
+        id: t.Any,
+        values: dict[str, t.Any],
+        *,
+        returning: bool,
+        instance: t.Self | None = None,
+    ):
+        assert values, "at least one column value is required"
+
+        mapper = inspect(cls)
+
+        for name in values:
+            if name not in mapper.column_attrs:
+                raise ValueError(f"{cls.__name__} has no column '{name}'")
+
+        pk_attr = getattr(cls, cls.primary_key_column().name)
+        stmt = sa.update(cls).where(pk_attr == id).values(**values)
+
+        if returning and instance is None:
+            stmt = stmt.returning(cls)
+        elif returning:
+            onupdate = [
+                prop.key
+                for prop in mapper.column_attrs
+                if prop.key not in values and prop.columns[0].onupdate is not None
+            ]
+            stmt = stmt.returning(
+                *[getattr(cls, name) for name in [*values, *onupdate]]
+            )
+
+        with get_session() as session:
+            # the instance is updated below, loaded copies in the session are left as they are
+            result = session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            )
+
+            record = None
+
+            if returning and instance is None:
+                record = result.scalars().one_or_none()
+                updated = record is not None
+            elif returning:
+                row = result.one_or_none()
+                updated = row is not None
+                values = dict(row._mapping) if row is not None else values
+            else:
+                updated = t.cast(sa.CursorResult, result).rowcount > 0
+
+            _commit_or_flush(session, preserve_loaded_state=True)
+
+        cls._expire_cached([id])
+
+        if instance is None:
+            return record if returning else updated
+
+        if not updated:
+            raise NoResultFound(f"{cls.__name__} {id} no longer exists in the database")
+
+        for name, value in values.items():
+            set_committed_value(instance, name, value)
+
+        return instance
+
+    @classmethod
+    def _expire_cached(cls, keys: list[t.Any]) -> None:
+        """
+        Drop records from the `CachedModelMixin` cache after a write.
+
+        Inside `transaction()` this happens again after the commit, since another caller in this process could cache
+        the old row before the transaction is committed.
+        """
+
+        if not issubclass(cls, CachedModelMixin):
+            return
+
+        def invalidate():
+            for key in keys:
+                cls._invalidate_cached(cls._coerce_primary_key(key))
+
+        invalidate()
+        _run_after_commit(invalidate)
+
+    @classmethod
+    def _counter_caches(cls) -> tuple[tuple[str, type["BaseModel"], str], ...]:
+        # columns only exist once the table is mapped, which is after `__init_subclass__`
+        if "__counter_caches__" not in cls.__dict__:
+            cls.__counter_caches__ = tuple(
+                (column.key, *column.info["counter_cache"])
+                for column in cls._table().columns
+                if "counter_cache" in column.info
+            )
+
+        return cls.__counter_caches__ or ()
+
+    def _counter_deltas(self, change: CounterChange):
+        """
+        (parent model, counter field, parent id) -> delta, for the counter caches affected by this write.
+
+        Reads the attribute history, so it must run before the change is flushed (or from a flush event).
+        """
+
+        deltas: dict[tuple[type[BaseModel], str, t.Any], int] = {}
+
+        for field, parent_cls, counter in self._counter_caches():
+            history = instance_state(self).attrs[field].history
+            # the value currently stored in the database
+            persisted = history.deleted[0] if history.deleted else getattr(self, field)
+
+            if change == "create":
+                changes = [(getattr(self, field), 1)]
+            elif change == "delete":
+                changes = [(persisted, -1)]
+            elif history.has_changes():
+                changes = [(persisted, -1), (getattr(self, field), 1)]
+            else:
+                changes = []
+
+            for parent_id, delta in changes:
+                if parent_id is not None:
+                    key = (parent_cls, counter, parent_id)
+                    deltas[key] = deltas.get(key, 0) + delta
+
+        return deltas
+
+    @classmethod
+    def _apply_counter_deltas(
+        cls, session: Session, deltas: dict[tuple[type["BaseModel"], str, t.Any], int]
+    ) -> None:
+        "increment counter caches atomically (`SET n = n + delta`) in the current transaction"
+
+        for (parent_cls, counter, parent_id), delta in deltas.items():
+            if delta == 0:
+                continue
+
+            pk_attr = getattr(parent_cls, parent_cls.primary_key_column().name)
+            counter_attr = getattr(parent_cls, counter)
+
+            # `synchronize_session` (evaluate) applies the increment to the parent if it's loaded in the session
+            session.execute(
+                sa.update(parent_cls)
+                .where(pk_attr == parent_id)
+                .values({counter_attr: counter_attr + delta})
+            )
+            parent_cls._expire_cached([parent_id])
+
+    @classmethod
+    def reset_counters(cls, *ids: t.Any) -> None:
+        """
+        Recompute the counter caches of this model (declared with `foreign_key(counter_cache=...)` on the child
+        models) from the child tables, for the given ids or every record. Runs one UPDATE per counter.
+
+        >>> Post.reset_counters()
+        """
+
+        pk_attr = getattr(cls, cls.primary_key_column().name)
+        counters = [
+            (child_cls, field, counter)
+            for mapper in inspect(cls).registry.mappers
+            if issubclass(child_cls := mapper.class_, BaseModel)
+            for field, parent_cls, counter in child_cls._counter_caches()
+            if parent_cls is cls
+        ]
+
+        assert counters, f"no counter caches reference {cls.__name__}"
+
+        with get_session() as session:
+            for child_cls, field, counter in counters:
+                child_count = (
+                    sa.select(sa.func.count())
+                    .where(getattr(child_cls, field) == pk_attr)
+                    .scalar_subquery()
                 )
-            method()
+                stmt = sa.update(cls).values({getattr(cls, counter): child_count})
+
+                if ids:
+                    stmt = stmt.where(pk_attr.in_(ids))
+
+                session.execute(stmt, execution_options={"synchronize_session": False})
+
+            _commit_or_flush(session)
+
+        if not issubclass(cls, CachedModelMixin):
+            return
+
+        if ids:
+            cls._expire_cached(list(ids))
+        else:
+            cls.clear_cache()
+
+    def _primary_key_value(self) -> t.Any:
+        return getattr(self, self.primary_key_column().name)
+
+    def _has_unsaved_changes(self) -> bool:
+        # in-place JSON mutations are invisible to SQLAlchemy until they are flagged
+        if isinstance(self, PydanticJSONMixin):
+            self.has_json_mutations()
+
+        return bool(self.modified_fields())
+
+    def _call_hook(self, hook_name: str) -> None:
+        for callback in self.__lifecycle_hooks__.get(hook_name, ()):
+            callback(self)
+
+    def _schedule_after_commit(self) -> None:
+        if "after_commit" in self.__lifecycle_hooks__:
+            _run_after_commit(partial(self._call_hook, "after_commit"))
 
     @classmethod
     @t.overload
@@ -297,8 +876,12 @@ class BaseModel(SQLModel):
         if not isinstance(instance, BaseModel):
             return instance
 
-        instance = cls._run_after_find_hook(instance)
-        instance._call_hook("after_initialize")
+        hooks = instance.__lifecycle_hooks__
+
+        if "after_find" in hooks or "after_initialize" in hooks:
+            instance = cls._run_after_find_hook(instance)
+            instance._call_hook("after_initialize")
+
         return instance
 
     def _get_around_context_manager(self, name: str) -> t.ContextManager | None:
@@ -335,6 +918,10 @@ class BaseModel(SQLModel):
 
         return self
 
+    async def arefresh(self):
+        "async version of `refresh()`"
+        return await _run_in_async_session(self.refresh)
+
     # TODO shouldn't this be handled by pydantic?
     # TODO where is this actually used? shoudl prob remove this
     # TODO should we even do this? Can we specify a better json rendering class?
@@ -343,12 +930,31 @@ class BaseModel(SQLModel):
 
     # TODO should move this to the wrapper
     @classmethod
-    def count(cls) -> int:
+    def count(cls, *, estimate: bool = False) -> int:
         """
         Returns the number of records in the database.
+
+        Pass `estimate=True` to read the row count from the Postgres planner statistics instead of scanning the
+        table. Tables estimated below `__count_estimate_threshold__` rows are counted exactly.
         """
+        key = (cls, "count", ())
+
+        if (statement := _finder_statements.get(key)) is None:
+            statement = _finder_statements.setdefault(
+                key, sm.select(sm.func.count()).select_from(cls)
+            )
+
         with get_session() as session:
-            return session.scalar(sm.select(sm.func.count()).select_from(cls))
+            if estimate and supports_estimates(session, cls):
+                approximate = table_row_estimate(session, cls)
+
+                if (
+                    approximate is not None
+                    and approximate >= cls.__count_estimate_threshold__
+                ):
+                    return approximate
+
+            return session.scalar(statement)
 
     # TODO got to be a better way to fwd these along...
     @classmethod
@@ -389,21 +995,237 @@ class BaseModel(SQLModel):
         return {attr.key for attr in insp.attrs if attr.history.has_changes()}
 
     @classmethod
-    def find_or_create_by(cls, **kwargs):
+    def find_or_create_by(cls, **kwargs) -> t.Self:
         """
         Find record or create it with the passed args if it doesn't exist.
+
+        When the args include every column of a unique constraint (or the primary key) the record is created with
+        `INSERT ... ON CONFLICT (columns) DO NOTHING RETURNING` and only looked up, by those unique columns, when it
+        already exists. New records take a single round trip, and a record created concurrently by another process is
+        returned instead of raising a unique violation. Otherwise the record is looked up first and created with
+        `save()`, which can create duplicates under concurrency.
+
+        The conflict target is the matched unique constraint with the fewest columns, preferring the primary key. A
+        violation of any other unique constraint raises `sqlalchemy.exc.IntegrityError`.
+
+        The create and save hooks run before the INSERT, the after_* hooks only run if the record was created.
         """
 
-        result = cls.get(**kwargs)
+        unique_column_sets = [
+            columns
+            for columns in cls._unique_column_sets()
+            if all(column in kwargs for column in columns)
+        ]
 
-        if result:
-            return result
+        if not unique_column_sets:
+            result = cls.get(**kwargs)
+
+            if result:
+                return result
+
+            new_model = cls(**kwargs)
+            new_model.save()
+
+            return new_model
+
+        # ON CONFLICT takes a single target, the narrowest constraint also covers any wider one including it
+        conflict_columns = min(unique_column_sets, key=len)
 
         new_model = cls(**kwargs)
-        new_model.save()
+        table = cls._table()
+        mapper = inspect(cls)
+
+        cm = new_model._get_around_context_manager("around_save") or nullcontext()
+
+        with get_session() as session:
+            # same ordering as `save()`: hooks run once the instance is attached to the session
+            with session.no_autoflush:
+                session.add(new_model)
+                new_model._call_hook("before_create")
+                new_model._call_hook("before_save")
+                session.expunge(new_model)
+
+            stmt = (
+                postgres_insert(table)
+                .values(new_model._insert_values())
+                .on_conflict_do_nothing(index_elements=conflict_columns)
+                .returning(*table.columns)
+            )
+
+            with cm:
+                row = session.execute(stmt, bind_arguments={"mapper": mapper}).first()
+
+                if row is not None and cls._counter_caches():
+                    cls._apply_counter_deltas(
+                        session, new_model._counter_deltas("create")
+                    )
+
+                _commit_or_flush(session)
+
+            if row is None:
+                return cls._find_conflicting(kwargs, conflict_columns)
+
+            # populate server defaults and make the instance persistent without another SELECT
+            for column, value in zip(table.columns, row):
+                set_committed_value(
+                    new_model, mapper.get_property_by_column(column).key, value
+                )
+
+            make_transient_to_detached(new_model)
+            session.add(new_model)
+
+            new_model._expire_cached([new_model._primary_key_value()])
+            new_model._call_hook("after_create")
+            new_model._call_hook("after_save")
+
+            if isinstance(new_model, PydanticJSONMixin):
+                new_model.__transform_dict_to_pydantic__()
+
+            new_model._schedule_after_commit()
 
         return new_model
 
+    @classmethod
+    def _find_conflicting(cls, values: dict[str, t.Any], columns: list[str]) -> t.Self:
+        "find the record which made an INSERT of `values` conflict on `columns`"
+
+        if record := cls.one_or_none(**{column: values[column] for column in columns}):
+            return record
+
+        # the conflicting record was deleted before the lookup
+        raise NoResultFound(
+            f"{cls.__name__} insert conflicted, but no record matches {', '.join(columns)}"
+        )
+
+    @classmethod
+    def find_or_create_all(
+        cls,
+        rows: t.Iterable[dict[str, t.Any]],
+        unique_by: str | list[str],
+        *,
+        batch_size: int = 1_000,
+    ) -> list[t.Self]:
+        """
+        Bulk version of `find_or_create_by()`, returns a record for every row in the same order as `rows`.
+
+        Each batch is a multi-row `INSERT ... ON CONFLICT (unique_by) DO NOTHING RETURNING`, followed by a single
+        SELECT for the rows which already existed. `unique_by` must be the columns of a unique constraint. Rows with
+        the same `unique_by` values resolve to the same record.
+
+        Lifecycle hooks are not run, like `upsert_all()`.
+
+        >>> Tag.find_or_create_all([{"name": "red"}, {"name": "blue"}], unique_by="name")
+        """
+
+        assert batch_size > 0, "batch_size must be greater than 0"
+
+        unique_by = [unique_by] if isinstance(unique_by, str) else unique_by
+
+        if set(unique_by) not in map(set, cls._unique_column_sets()):
+            raise ValueError(
+                f"{cls.__name__} has no unique constraint on {', '.join(unique_by)}"
+            )
+
+        # construct the models to apply field defaults and coerce the unique values (e.g. str -> TypeID)
+        instances = [cls(**row) for row in rows]
+        keys = [
+            tuple(getattr(instance, column) for column in unique_by)
+            for instance in instances
+        ]
+        unique_instances = dict(zip(keys, instances))
+
+        unique_columns = [getattr(cls, column) for column in unique_by]
+        insert_stmt = (
+            postgres_insert(cls)
+            .on_conflict_do_nothing(index_elements=unique_by)
+            .returning(cls)
+        )
+
+        records: dict[tuple, t.Self] = {}
+
+        with get_session() as session:
+            for batch in itertools.batched(unique_instances.items(), batch_size):
+                # rows leaving different columns to their database defaults can't share an INSERT
+                by_columns: dict[frozenset, list[dict[str, t.Any]]] = {}
+
+                for _, instance in batch:
+                    values = instance._insert_values()
+                    by_columns.setdefault(frozenset(values), []).append(values)
+
+                created: list[t.Self] = []
+
+                for values in by_columns.values():
+                    for record in session.scalars(insert_stmt, values):
+                        key = tuple(getattr(record, column) for column in unique_by)
+                        records[key] = record
+                        created.append(record)
+
+                if created and cls._counter_caches():
+                    cls._apply_counter_deltas(
+                        session, _sum_counter_deltas(created, "create")
+                    )
+
+                existing_keys = [key for key, _ in batch if key not in records]
+
+                if existing_keys:
+                    select_stmt = sm.select(cls).where(
+                        sa.tuple_(*unique_columns).in_(existing_keys)
+                    )
+
+                    for record in session.exec(select_stmt):
+                        key = tuple(getattr(record, column) for column in unique_by)
+                        records[key] = cls._run_after_load_hooks(record)
+
+            _commit_or_flush(session, preserve_loaded_state=True)
+
+        cls._expire_cached([record._primary_key_value() for record in records.values()])
+
+        return [records[key] for key in keys]
+
+    @classmethod
+    def _table(cls) -> sa.Table:
+        "the mapped table, type checkers don't know about `__table__` since only `table=True` models have it"
+        return t.cast(sa.Table, inspect(cls).local_table)
+
+    @classmethod
+    def _unique_column_sets(cls) -> list[list[str]]:
+        "columns of every unique constraint and unique index, the primary key first"
+
+        table = cls._table()
+        column_sets = [[column.name for column in table.primary_key.columns]]
+        # constraints and indexes are sets, sort them so the order is stable
+        column_sets += sorted(
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints
+            if isinstance(constraint, sa.UniqueConstraint)
+        )
+        column_sets += sorted(
+            [column.name for column in index.columns]
+            for index in table.indexes
+            # partial indexes can't be inferred as a conflict target without their WHERE clause
+            if index.unique and not index.dialect_options["postgresql"]["where"]
+        )
+        column_sets += [[column.name] for column in table.columns if column.unique]
+
+        return [columns for columns in column_sets if columns]
+
+    def _insert_values(self) -> dict[str, t.Any]:
+        "column values for an INSERT, leaving unset columns with a default to the database"
+
+        values = {}
+
+        for column in self._table().columns:
+            value = getattr(self, column.key, None)
+
+            if value is None and (
+                column.default is not None or column.server_default is not None
+            ):
+                continue
+
+            values[column.key] = value
+
+        return values
+
     @classmethod
     def find_or_initialize_by(cls, **kwargs):
         """
@@ -449,7 +1271,7 @@ class BaseModel(SQLModel):
     # TODO can we type the method signature a bit better?
     # def get(cls, *args: sa.BinaryExpression, **kwargs: t.Any):
     @classmethod
-    def get(cls, *args: t.Any, **kwargs: t.Any):
+    def get(cls, *args: t.Any, **kwargs: t.Any) -> t.Self | None:
         """
         Gets a single record (or None) from the database. Pass an PK ID or kwargs to filter by.
         """
@@ -463,12 +1285,166 @@ class BaseModel(SQLModel):
             kwargs[id_field_name] = args[0]
             args = ()
 
-        statement = select(cls).filter(*args).filter_by(**kwargs)
+        statement, params = cls._filter_statement(args, kwargs)
+
+        with get_session() as session:
+            # cast so the mixin check doesn't narrow `cls` and leak into the return type
+            if (
+                issubclass(t.cast(t.Any, cls), CachedModelMixin)
+                and not args
+                and list(kwargs) == [cls.primary_key_column().name]
+            ):
+                result = cls._read_through_cache(
+                    session,
+                    cls._coerce_primary_key(next(iter(kwargs.values()))),
+                    lambda: session.exec(statement, params=params).first(),
+                )
+            else:
+                result = session.exec(statement, params=params).first()
+
+            return cls._run_after_load_hooks(result)
+
+    @classmethod
+    def find(cls, id: t.Any) -> t.Self:
+        """
+        Find a record by primary key.
+
+        Unlike `get()`, this is backed by `Session.get`: a record which is already loaded in the current
+        `global_session()` is returned from the identity map without querying the database.
+
+        Raises:
+            sqlalchemy.exc.NoResultFound: If no record is found.
+        """
+
+        key = cls._coerce_primary_key(id)
 
         with get_session() as session:
-            result = session.exec(statement).first()
+            result = cls._read_through_cache(
+                session, key, lambda: session.get(cls, key)
+            )
+
+            if result is None:
+                raise NoResultFound(f"{cls.__name__} with id {id} not found")
+
             return cls._run_after_load_hooks(result)
 
+    @classmethod
+    def find_many(
+        cls,
+        ids: t.Iterable[t.Any],
+        *,
+        raise_on_missing: bool = False,
+        batch_size: int = 1_000,
+    ) -> list[t.Self]:
+        """
+        Find records by primary key, returned in the same order as `ids`.
+
+        Records already loaded in the current `global_session()` are taken from the identity map. The rest are loaded
+        with `WHERE id IN (...)` queries of at most `batch_size` ids each.
+
+        Missing ids are skipped unless `raise_on_missing=True`, which raises `sqlalchemy.exc.NoResultFound`.
+        """
+
+        assert batch_size > 0, "batch_size must be greater than 0"
+
+        keys = [cls._coerce_primary_key(id) for id in ids]
+        pk_attr = getattr(cls, cls.primary_key_column().name)
+
+        with get_session() as session:
+            found = cls._find_loaded(session, keys)
+            missing_keys = [key for key in dict.fromkeys(keys) if key not in found]
+
+            for batch in itertools.batched(missing_keys, batch_size):
+                for instance in session.exec(select(cls).where(pk_attr.in_(batch))):
+                    found[getattr(instance, pk_attr.key)] = instance
+
+            if raise_on_missing and (
+                not_found := [key for key in keys if key not in found]
+            ):
+                raise NoResultFound(f"{cls.__name__} records not found: {not_found}")
+
+            for instance in found.values():
+                cls._run_after_load_hooks(instance)
+
+            return [found[key] for key in keys if key in found]
+
+    @classmethod
+    def _read_through_cache(
+        cls, session: Session, key: t.Any, load: t.Callable[[], t.Self | None]
+    ) -> t.Self | None:
+        "consult the `CachedModelMixin` cache between the session identity map and the database"
+
+        if not issubclass(cls, CachedModelMixin):
+            return load()
+
+        # an instance loaded in this session may have unflushed changes, which a cached copy would not reflect
+        if loaded := cls._find_loaded(session, [key]):
+            return loaded[key]
+
+        if (cached := cls._cached_copy(key)) is not None:
+            # the session holds one instance per row: the cached values refresh an instance expired by a commit,
+            # otherwise the copy joins the session so later lookups in it return the same instance
+            if session.identity_map.get(identity_key(cls, key)) is not None:
+                cached = session.merge(cached, load=False)
+            else:
+                session.add(cached)
+
+            # snapshot JSON fields so in-place mutations on the copy are tracked
+            if isinstance(cached, PydanticJSONMixin):
+                cached.__transform_dict_to_pydantic__()
+
+            return cached
+
+        result = load()
+
+        # rows read before a commit may hold writes which a rollback would undo, only cache committed values
+        if (
+            result is not None
+            and _transaction_callbacks.get() is None
+            and not _has_uncommitted_flush(session)
+        ):
+            cls._cache_instance(key, result)
+
+        return result
+
+    @classmethod
+    def _find_loaded(cls, session: Session, keys: list[t.Any]) -> dict[t.Any, t.Self]:
+        "look up primary keys in the session identity map, skipping anything which would need a reload"
+
+        loaded = {}
+
+        for key in keys:
+            instance = session.identity_map.get(identity_key(cls, key))
+
+            if instance is None:
+                continue
+
+            state = instance_state(instance)
+            if state.expired or state.deleted:
+                continue
+
+            loaded[key] = instance
+
+        return loaded
+
+    @classmethod
+    def _coerce_primary_key(cls, value: t.Any) -> t.Any:
+        """
+        Normalize an id to the value stored in the identity map. A TypeID column accepts TypeID strings and raw UUIDs
+        in queries, but identity map lookups need the exact `TypeID` the column loads.
+        """
+
+        pk_type = cls.primary_key_column().type
+
+        if value is None or not isinstance(pk_type, TypeIDType):
+            return value
+
+        # round trip through the column type so every accepted input format is handled, it ignores the dialect
+        dialect = t.cast(sa.Dialect, None)
+        return pk_type.process_result_value(
+            pk_type.process_bind_param(value, dialect), dialect
+        )
+
     @classmethod
     def one_or_none(cls, *args: t.Any, **kwargs: t.Any):
         """
@@ -477,10 +1453,10 @@ class BaseModel(SQLModel):
         """
 
         args, kwargs = cls.__process_filter_args__(*args, **kwargs)
-        statement = select(cls).filter(*args).filter_by(**kwargs)
+        statement, params = cls._filter_statement(args, kwargs)
 
         with get_session() as session:
-            result = session.exec(statement).one_or_none()
+            result = session.exec(statement, params=params).one_or_none()
             return cls._run_after_load_hooks(result)
 
     @classmethod
@@ -494,12 +1470,80 @@ class BaseModel(SQLModel):
         """
 
         args, kwargs = cls.__process_filter_args__(*args, **kwargs)
-        statement = select(cls).filter(*args).filter_by(**kwargs)
+        statement, params = cls._filter_statement(args, kwargs)
 
         with get_session() as session:
-            result = session.exec(statement).one()
+            result = session.exec(statement, params=params).one()
             return cls._run_after_load_hooks(result)
 
+    # async finders run the sync finders above on an `AsyncSession`, so hooks and JSON rehydration behave the same
+
+    @classmethod
+    async def aget(cls, *args: t.Any, **kwargs: t.Any) -> t.Self | None:
+        return await _run_in_async_session(partial(cls.get, *args, **kwargs))
+
+    @classmethod
+    async def afind(cls, id: t.Any) -> t.Self:
+        return await _run_in_async_session(partial(cls.find, id))
+
+    @classmethod
+    async def aone(cls, *args: t.Any, **kwargs: t.Any) -> t.Self:
+        # `one()` raises instead of returning None
+        return t.cast(
+            t.Self, await _run_in_async_session(partial(cls.one, *args, **kwargs))
+        )
+
+    @classmethod
+    async def aone_or_none(cls, *args: t.Any, **kwargs: t.Any) -> t.Self | None:
+        return await _run_in_async_session(partial(cls.one_or_none, *args, **kwargs))
+
+    @classmethod
+    async def acount(cls, *, estimate: bool = False) -> int:
+        return await _run_in_async_session(partial(cls.count, estimate=estimate))
+
+    @classmethod
+    def _filter_statement(
+        cls, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]
+    ) -> tuple[SelectOfScalar[t.Self], dict[str, t.Any] | None]:
+        """
+        Build `select(cls).filter(*args).filter_by(**kwargs)`, returning the statement and the params to run it with.
+
+        Keyword-only filters on plain columns reuse a statement with bound parameters, cached by the filtered field
+        names. SQLAlchemy memoizes the cache key on the statement object, so repeated finder calls skip both
+        statement construction and cache key generation. Anything else (SQL expressions, `None` which needs `IS NULL`,
+        relationships) builds a fresh statement.
+        """
+
+        if args or any(
+            value is None or isinstance(value, sa.ClauseElement)
+            for value in kwargs.values()
+        ):
+            return select(cls).filter(*args).filter_by(**kwargs), None
+
+        field_names = tuple(sorted(kwargs))
+        key = (cls, "select", field_names)
+
+        if (statement := _finder_statements.get(key)) is None:
+            column_attrs = sa.inspect(cls).column_attrs
+
+            if not all(name in column_attrs for name in field_names):
+                return select(cls).filter_by(**kwargs), None
+
+            statement = _finder_statements.setdefault(
+                key,
+                select(cls).where(
+                    *(
+                        getattr(cls, name) == sa.bindparam(f"filter_{name}")
+                        for name in field_names
+                    )
+                ),
+            )
+
+        # the cache is shared by every model, the key pins the statement to `cls`
+        return t.cast(SelectOfScalar[t.Self], statement), {
+            f"filter_{name}": value for name, value in kwargs.items()
+        }
+
     @classmethod
     def __process_filter_args__(cls, *args: t.Any, **kwargs: t.Any):
         """
@@ -529,15 +1573,52 @@ class BaseModel(SQLModel):
                 yield cls._run_after_load_hooks(result)
 
     @classmethod
-    def sample(cls):
+    def sample(cls, *, strategy: SampleStrategy = "auto") -> t.Self:
         """
         Pick a random record from the database. Raises if none exist.
 
-        Helpful for testing and console debugging.
+        Helpful for testing and console debugging. See `QueryWrapper.sample()` for the available strategies, large
+        tables are sampled with `TABLESAMPLE` instead of sorting every row.
         """
 
-        query = sm.select(cls).order_by(sa.sql.func.random()).limit(1)
+        result = cls.select().sample(strategy=strategy)
 
-        with get_session() as session:
-            result = session.exec(query).one()
-            return cls._run_after_load_hooks(result)
+        if result is None:
+            raise NoResultFound("No row was found when one was required")
+
+        return result
+
+
+def _sum_counter_deltas(
+    instances: t.Iterable[BaseModel], change: CounterChange
+) -> dict[tuple[type[BaseModel], str, t.Any], int]:
+    deltas: dict[tuple[type[BaseModel], str, t.Any], int] = {}
+
+    for instance in instances:
+        if isinstance(instance, BaseModel) and instance._counter_caches():
+            for key, delta in instance._counter_deltas(change).items():
+                deltas[key] = deltas.get(key, 0) + delta
+
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _update_counter_caches(session: Session, flush_context) -> None:
+    """
+    Apply the counter caches of every record created, moved or deleted by a flush, in the flush's transaction.
+
+    Running on the flush (the attribute history still holds the flushed changes here) covers autoflushes, which would
+    otherwise clear a change before `save()` could see it, and aggregates a batch into one UPDATE per parent.
+    """
+
+    deltas: dict[tuple[type[BaseModel], str, t.Any], int] = {}
+
+    for key, delta in itertools.chain(
+        _sum_counter_deltas(session.new, "create").items(),
+        _sum_counter_deltas(session.dirty, "update").items(),
+        _sum_counter_deltas(session.deleted, "delete").items(),
+    ):
+        deltas[key] = deltas.get(key, 0) + delta
+
+    if deltas:
+        BaseModel._apply_counter_deltas(session, deltas)
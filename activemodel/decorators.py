@@ -10,3 +10,43 @@ def property_field(func=None, /, **kwargs):
     if func is None:
         return wrap
     return wrap(func)
+
+
+LIFECYCLE_HOOKS = (
+    "before_create",
+    "after_create",
+    "before_update",
+    "after_update",
+    "before_save",
+    "after_save",
+    "before_delete",
+    "after_delete",
+    "after_commit",
+    "after_find",
+    "after_initialize",
+)
+"hooks which can be registered with `@hook`, `around_*` hooks are context managers and must use the method name"
+
+
+def hook(*hook_names: str):
+    """
+    Register a model method as a lifecycle callback, in addition to any method named after the hook itself.
+
+    A hook can have any number of callbacks. They run after the method named after the hook, parent classes first,
+    in the order they are defined.
+
+    >>> @hook("before_create", "before_update")
+    >>> def normalize_email(self):
+    >>>     self.email = self.email.lower()
+    """
+
+    assert len(hook_names) > 0, "Must pass at least one hook name"
+
+    if unknown_hooks := set(hook_names) - set(LIFECYCLE_HOOKS):
+        raise ValueError(f"Unknown lifecycle hooks: {', '.join(sorted(unknown_hooks))}")
+
+    def wrap(f):
+        f.__lifecycle_hooks__ = (*getattr(f, "__lifecycle_hooks__", ()), *hook_names)
+        return f
+
+    return wrap
@@ -4,3 +4,15 @@ class TypeIDValidationError(ValueError):
     """
 
     pass
+
+
+class NPlusOneError(RuntimeError):
+    """
+    Raised when N+1 detection is set to `raise` and a relationship is lazy loaded for many instances of one query
+    """
+
+
+class NPlusOneWarning(UserWarning):
+    """
+    Emitted when N+1 detection is set to `warn` and a relationship is lazy loaded for many instances of one query
+    """
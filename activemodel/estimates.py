@@ -0,0 +1,96 @@
+"""
+Row count estimates from the Postgres planner statistics, for `count(estimate=True)`.
+
+An exact `COUNT(*)` reads every visible row, which takes seconds on large tables. The estimates here only read
+`pg_class` or plan the query, so they are constant time but can be off by the amount the table changed since it was
+last analyzed (autovacuum keeps this reasonably small).
+"""
+
+import json
+import typing as t
+
+import sqlalchemy as sa
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlmodel import Session
+
+_TABLE_ESTIMATE = sa.text(
+    """
+    SELECT
+        CASE
+            -- the table has never been analyzed
+            WHEN reltuples < 0 THEN NULL
+            WHEN relpages = 0 THEN reltuples
+            -- scale the tuple density from the last analyze by the current size, like the planner does
+            ELSE reltuples / relpages * (pg_relation_size(oid) / current_setting('block_size')::int)
+        END,
+        pg_relation_size(oid) / current_setting('block_size')::int
+    FROM pg_class
+    WHERE oid = to_regclass(:table_name)
+    """
+).columns(sa.column("estimate", sa.Float), sa.column("pages", sa.Integer))
+
+
+class Explain(Executable, ClauseElement):
+    "`EXPLAIN (FORMAT JSON)` of a statement, bound parameters are processed like the statement's own"
+
+    inherit_cache = False
+    # planning a statement does not write, so it may run on a read replica
+    is_select = True
+
+    def __init__(self, statement: sa.Executable):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _dialect(session: Session, model: type) -> sa.Dialect:
+    # without a clause `RoutingSession` treats the lookup as a write, which would pin the session to the primary
+    return session.get_bind(sa.inspect(model), clause=_TABLE_ESTIMATE).dialect
+
+
+def supports_estimates(session: Session, model: type) -> bool:
+    return _dialect(session, model).name == "postgresql"
+
+
+def table_size_estimate(session: Session, model: type) -> tuple[int, int] | None:
+    "estimated number of rows and the current number of pages of the model's table, None if it was never analyzed"
+
+    table = sa.inspect(model).local_table
+    preparer = _dialect(session, model).identifier_preparer
+
+    row = session.execute(
+        _TABLE_ESTIMATE,
+        {"table_name": preparer.format_table(table)},
+        bind_arguments={"mapper": sa.inspect(model)},
+    ).one_or_none()
+
+    if row is None or row.estimate is None:
+        return None
+
+    return int(row.estimate), row.pages
+
+
+def table_row_estimate(session: Session, model: type) -> int | None:
+    "estimated number of rows in the model's table, None if the table has never been analyzed"
+
+    size = table_size_estimate(session, model)
+    return None if size is None else size[0]
+
+
+def query_row_estimate(session: Session, model: type, statement: sa.Executable) -> int:
+    "number of rows the planner expects `statement` to return"
+
+    plan = session.scalar(
+        t.cast(sa.Executable, Explain(statement)),
+        bind_arguments={"mapper": sa.inspect(model)},
+    )
+
+    # psycopg decodes the json column, other drivers return text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
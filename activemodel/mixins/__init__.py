@@ -1,5 +1,6 @@
 from typeid.integrations.pydantic import TypeIDField
 
+from .cached import CachedModelMixin
 from .pydantic_json import PydanticJSONMixin
 from .soft_delete import SoftDeletionMixin
 from .timestamps import TimestampsMixin
@@ -7,6 +8,7 @@ from .typeid import TypeIDMixin
 from activemodel.types.typeid import TypeIDPrimaryKey
 
 __all__ = [
+    "CachedModelMixin",
     "PydanticJSONMixin",
     "SoftDeletionMixin",
     "TimestampsMixin",
@@ -0,0 +1,160 @@
+"""Process-local read-through cache for hot models looked up by primary key.
+
+The cache stores a deep copy of each record's column values, never the instance itself, so cached state can't leak
+between sessions. Every cache hit builds a fresh instance from those values, which joins the calling session.
+"""
+
+import copy
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import instance_state, set_committed_value
+from sqlalchemy.orm.instrumentation import manager_of_class
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache with an optional TTL, keyed by primary key.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None):
+        assert max_size > 0, "max_size must be greater than 0"
+
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[t.Any, tuple[float, dict[str, t.Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: t.Any) -> dict[str, t.Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, values = entry
+
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return values
+
+    def set(self, key: t.Any, values: dict[str, t.Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), values)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: t.Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        "drop every entry and reset the counters"
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+class CachedModelMixin:
+    """
+    Opt-in, per-process read-through cache for primary key lookups.
+
+    `get(id)` and `find(id)` consult the cache before the database. `save()`, `delete()`, `upsert()`,
+    `upsert_all()` and `soft_delete()` invalidate the record in the calling process. Other processes only see the
+    change once their entry expires, so keep `__cache_ttl__` short for data that changes.
+
+    >>> class Plan(BaseModel, CachedModelMixin, table=True):
+    >>>     __cache_max_size__ = 500
+    >>>     __cache_ttl__ = 30.0
+
+    Cache hits build a new instance from the cached columns, relationships are not loaded. Inside `global_session()`
+    the instance joins the session (an instance of the same record expired by a commit is refreshed instead), so
+    lookups within one session return the same instance. Otherwise it is detached once the lookup returns.
+    """
+
+    __cache_max_size__: t.ClassVar[int] = 1_000
+    "maximum number of records to keep before evicting the least recently used"
+
+    __cache_ttl__: t.ClassVar[float | None] = 60.0
+    "seconds a cached record is served before it is reloaded, `None` to only rely on invalidation"
+
+    _model_cache: t.ClassVar[ModelCache]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # every model gets its own cache, even when inheriting from another cached model
+        cls._model_cache = ModelCache(cls.__cache_max_size__, cls.__cache_ttl__)
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        "hit, miss and eviction counters along with the current number of cached records"
+        return cls._model_cache.stats()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._model_cache.clear()
+
+    @classmethod
+    def _cached_copy(cls, key: t.Any) -> t.Self | None:
+        values = cls._model_cache.get(key)
+
+        if values is None:
+            return None
+
+        # build the instance the same way SQLAlchemy does when loading a row, skipping `__init__` and its hooks
+        instance = manager_of_class(cls).new_instance()
+
+        for field_name, value in copy.deepcopy(values).items():
+            set_committed_value(instance, field_name, value)
+
+        # marks the instance as persistent-but-detached so `save()` issues an UPDATE instead of an INSERT
+        make_transient_to_detached(instance)
+
+        return instance
+
+    @classmethod
+    def _cache_instance(cls, key: t.Any, instance: t.Any) -> None:
+        state = instance_state(instance)
+
+        values = {
+            column_attr.key: state.dict[column_attr.key]
+            for column_attr in state.mapper.column_attrs
+            if column_attr.key in state.dict
+        }
+
+        cls._model_cache.set(key, copy.deepcopy(values))
+
+    @classmethod
+    def _invalidate_cached(cls, key: t.Any) -> None:
+        cls._model_cache.invalidate(key)
@@ -7,14 +7,19 @@ from whenever import ZonedDateTime
 class SoftDeleteRecord(Protocol):
     deleted_at: ZonedDateTime | None
 
+    def is_new(self) -> bool: ...
+
     def save(self) -> Self: ...
 
+    def update_columns(self, *, returning: bool = False, **values) -> Self: ...
+
 
 class SoftDeletionMixin:
     """
     Soft delete records by setting `deleted_at` instead of removing the row.
 
-    Call `soft_delete()` to timestamp the record and persist that change.
+    Call `soft_delete()` to timestamp the record and persist that change. Only `deleted_at` (and `onupdate` columns
+    like `updated_at`) are written, without running the save hooks.
     """
 
     deleted_at: ZonedDateTime | None = Field(default=None, nullable=True)
@@ -22,6 +27,11 @@ class SoftDeletionMixin:
     def soft_delete[T: SoftDeleteRecord](self: T) -> T:
         """Timestamp `deleted_at` and persist the record."""
 
-        self.deleted_at = ZonedDateTime.now("UTC")
-        # TODO we should limit the fields updated to just `deleted_at`
-        return self.save()
+        deleted_at = ZonedDateTime.now("UTC")
+
+        if self.is_new():
+            self.deleted_at = deleted_at
+            return self.save()
+
+        # RETURNING reads back the timestamp as stored, at the database's precision
+        return self.update_columns(deleted_at=deleted_at, returning=True)
@@ -0,0 +1,181 @@
+"""
+Detect N+1 queries: the same relationship lazy loaded, one statement at a time, for many instances returned by a
+single query.
+
+>>> with global_session(n_plus_one="raise"):
+>>>     for post in Post.select().all():
+>>>         post.author  # raises NPlusOneError on the second post
+
+Detection is opt-in. Pass `n_plus_one` to `global_session()` or set `ACTIVEMODEL_N_PLUS_ONE` to `warn`, `log` or
+`raise` to enable it for every global session, e.g. `raise` in test and development and `log` in production.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import typing as t
+import warnings
+from pathlib import Path
+
+import sqlalchemy
+import sqlmodel
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .errors import NPlusOneError, NPlusOneWarning
+from .logger import logger
+
+type NPlusOneAction = t.Literal["warn", "log", "raise"]
+
+N_PLUS_ONE_ACTIONS: tuple[str, ...] = t.get_args(NPlusOneAction.__value__)
+
+_INFO_KEY = "activemodel_n_plus_one"
+"key of the detector in `session.info` and of the query number in a query's `context.attributes`"
+
+_LIBRARY_DIRS = (*sqlalchemy.__path__, *sqlmodel.__path__, str(Path(__file__).parent))
+"frames in these directories are skipped when looking for the code which triggered a lazy load"
+
+_load_listener_registered = False
+_load_listener_lock = threading.Lock()
+
+
+class NPlusOneDetector:
+    """
+    Count lazy loads per relationship and per query which loaded the parent instances. Once `threshold` distinct
+    instances from the same query lazy loaded the same relationship, report it (once) according to `action`.
+
+    A relationship whose target is already in the session (e.g. a many-to-one `get()`) does not issue a statement and
+    is not counted.
+    """
+
+    def __init__(self, action: NPlusOneAction = "raise", *, threshold: int = 2):
+        assert action in N_PLUS_ONE_ACTIONS, (
+            f"n_plus_one action must be one of {', '.join(N_PLUS_ONE_ACTIONS)}"
+        )
+        assert threshold >= 2, "threshold must be at least 2"
+
+        self.action = action
+        self.threshold = threshold
+
+        self._query_numbers = itertools.count(1)
+        # identity key of a loaded instance -> number of the query which loaded it
+        self._origins: dict[tuple, int] = {}
+        # (query number, relationship) -> identity keys of the instances which lazy loaded it
+        self._lazy_loads: dict[tuple[int, str], set[tuple]] = {}
+        self._reported: set[tuple[int, str]] = set()
+
+    def attach(self, session: Session) -> None:
+        _register_load_listener()
+
+        session.info[_INFO_KEY] = self
+        event.listen(session, "do_orm_execute", self._on_execute)
+
+    def detach(self, session: Session) -> None:
+        event.remove(session, "do_orm_execute", self._on_execute)
+        session.info.pop(_INFO_KEY, None)
+
+    def _record_load(self, state, context) -> None:
+        query_number = context.attributes.get(_INFO_KEY)
+
+        if query_number is None:
+            query_number = context.attributes[_INFO_KEY] = next(self._query_numbers)
+
+        self._origins[state.key] = query_number
+
+    def _on_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        parent = orm_execute_state.lazy_loaded_from
+        path = orm_execute_state.loader_strategy_path
+
+        # selectin and subquery loads are relationship loads too, but they load every parent in one statement
+        if (
+            parent is None
+            or parent.key is None
+            or path is None
+            or not orm_execute_state.is_relationship_load
+        ):
+            return
+
+        query_number = self._origins.get(parent.key)
+
+        # the parent was not loaded by a query, e.g. it was created in this session
+        if query_number is None:
+            return
+
+        # the path ends with the relationship property being loaded
+        relationship = str(path.path[-1])
+        key = (query_number, relationship)
+
+        loaded = self._lazy_loads.setdefault(key, set())
+        loaded.add(parent.key)
+
+        if len(loaded) >= self.threshold and key not in self._reported:
+            self._reported.add(key)
+            self._report(relationship, len(loaded))
+
+    def _report(self, relationship: str, count: int) -> None:
+        filename, lineno = _callsite()
+        message = (
+            f"N+1 query: {relationship} was lazy loaded for {count} instances returned by the same query "
+            f"at {filename}:{lineno}. Eager load it, e.g. `.options(selectinload(...))`"
+        )
+
+        if self.action == "raise":
+            raise NPlusOneError(message)
+
+        if self.action == "warn":
+            warnings.warn_explicit(message, NPlusOneWarning, filename, lineno)
+            return
+
+        logger.warning(message)
+
+
+def detector_from_environment() -> NPlusOneDetector | None:
+    "build a detector from `ACTIVEMODEL_N_PLUS_ONE`, None when it is unset or empty"
+
+    action = os.getenv("ACTIVEMODEL_N_PLUS_ONE", "").strip().lower()
+
+    if not action:
+        return None
+
+    if action not in N_PLUS_ONE_ACTIONS:
+        raise ValueError(
+            f"ACTIVEMODEL_N_PLUS_ONE must be one of {', '.join(N_PLUS_ONE_ACTIONS)}, got {action!r}"
+        )
+
+    return NPlusOneDetector(t.cast(NPlusOneAction, action))
+
+
+def _on_load(target, context) -> None:
+    detector = context.session.info.get(_INFO_KEY) if context.session else None
+
+    if detector is not None:
+        detector._record_load(target._sa_instance_state, context)
+
+
+def _register_load_listener() -> None:
+    "track which query loaded each instance, only registered once detection is first enabled"
+
+    global _load_listener_registered
+
+    with _load_listener_lock:
+        if _load_listener_registered:
+            return
+
+        from .base_model import BaseModel
+
+        event.listen(BaseModel, "load", _on_load, propagate=True)
+        _load_listener_registered = True
+
+
+def _callsite() -> tuple[str, int]:
+    "the first frame outside of activemodel, sqlmodel and sqlalchemy, i.e. the code accessing the relationship"
+
+    frame = sys._getframe(1)
+
+    while frame.f_back is not None and frame.f_code.co_filename.startswith(
+        _LIBRARY_DIRS
+    ):
+        frame = frame.f_back
+
+    return frame.f_code.co_filename, frame.f_lineno
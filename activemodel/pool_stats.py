@@ -0,0 +1,149 @@
+"""
+Connection pool metrics, collected from SQLAlchemy pool events.
+
+Helps tell apart time spent waiting on the pool from time spent waiting on the database. Recording a metric is a
+few integer updates under a lock, so this is always enabled.
+"""
+
+import bisect
+import threading
+import time
+import typing as t
+
+import sqlalchemy as sa
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import Pool
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000)
+"upper bounds of the checkout wait histogram buckets, anything slower lands in the `+Inf` bucket"
+
+
+class PoolStats:
+    """
+    Counters for a single engine's pool.
+
+    Checkout wait is measured around the pool's internal `_do_get`, which includes opening a new connection when the
+    pool is below capacity. It is only recorded for pools created by `pool_class()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        self.checkouts = 0
+        self.connections_opened = 0
+        self.pre_ping_failures = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+        self._wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self._wait_count = 0
+        self._wait_sum_ms = 0.0
+        self._wait_max_ms = 0.0
+
+        # id of each open connection record -> monotonic time it connected
+        self._connected_at: dict[int, float] = {}
+
+    def pool_class[P: Pool](self, base: type[P]) -> type[P]:
+        "subclass `base` to time every checkout. A subclass survives `engine.dispose()`, which recreates the pool"
+
+        stats = self
+
+        class InstrumentedPool(base):  # type: ignore[valid-type,misc]
+            def _do_get(self):
+                started_at = time.perf_counter()
+
+                try:
+                    return super()._do_get()
+                finally:
+                    stats.record_checkout_wait(time.perf_counter() - started_at)
+
+        InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+        return t.cast(type[P], InstrumentedPool)
+
+    def record_checkout_wait(self, seconds: float) -> None:
+        wait_ms = seconds * 1_000
+        bucket = bisect.bisect_left(CHECKOUT_WAIT_BUCKETS_MS, wait_ms)
+
+        with self._lock:
+            self._wait_buckets[bucket] += 1
+            self._wait_count += 1
+            self._wait_sum_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+    def attach(self, engine: Engine) -> None:
+        "listen to the engine's pool events, listeners carry over when the pool is recreated"
+
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connections_opened += 1
+                self._connected_at[id(connection_record)] = time.monotonic()
+
+        def on_close(dbapi_connection, connection_record):
+            with self._lock:
+                self._connected_at.pop(id(connection_record), None)
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        def on_soft_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.soft_invalidations += 1
+
+        def on_handle_error(context: sa.engine.ExceptionContext):
+            if context.is_pre_ping:
+                with self._lock:
+                    self.pre_ping_failures += 1
+
+        event.listen(engine, "connect", on_connect)
+        event.listen(engine, "close", on_close)
+        # detached connections are no longer managed by the pool
+        event.listen(engine, "detach", on_close)
+        event.listen(engine, "checkout", on_checkout)
+        event.listen(engine, "invalidate", on_invalidate)
+        event.listen(engine, "soft_invalidate", on_soft_invalidate)
+        event.listen(engine, "handle_error", on_handle_error)
+
+    def as_dict(self, pool: Pool) -> dict[str, t.Any]:
+        now = time.monotonic()
+
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+            wait_buckets = dict(
+                zip(
+                    [*map(str, CHECKOUT_WAIT_BUCKETS_MS), "+Inf"],
+                    self._wait_buckets,
+                )
+            )
+
+            return {
+                # gauges are only available on queue-based pools, which is the default for postgres
+                "pool_size": _pool_gauge(pool, "size"),
+                "checked_out": _pool_gauge(pool, "checkedout"),
+                "checked_in": _pool_gauge(pool, "checkedin"),
+                "overflow": _pool_gauge(pool, "overflow"),
+                "checkouts": self.checkouts,
+                "checkout_wait_ms": {
+                    "count": self._wait_count,
+                    "sum": self._wait_sum_ms,
+                    "max": self._wait_max_ms,
+                    "buckets": wait_buckets,
+                },
+                "connections_opened": self.connections_opened,
+                "connection_age_seconds": {
+                    "max": max(ages, default=0.0),
+                    "mean": sum(ages) / len(ages) if ages else 0.0,
+                },
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+            }
+
+
+def _pool_gauge(pool: Pool, name: str) -> int | None:
+    gauge = getattr(pool, name, None)
+    return t.cast(int, gauge()) if callable(gauge) else None
@@ -0,0 +1,230 @@
+"""
+Record the statements executed inside a block, to attribute database cost to a request or task.
+
+>>> with activemodel.query_log() as log:
+>>>     User.get(email="a@example.com")
+>>> log.count, log.duration
+>>> log.by_fingerprint()
+
+The listeners are attached to every engine created by `SessionManager`. Outside of a `query_log()` block they only do
+a single ContextVar lookup per statement.
+"""
+
+import contextlib
+import contextvars
+import functools
+import random
+import re
+import sys
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from sqlalchemy import Engine, event
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+_MODEL_FILES = (
+    str(Path(_PACKAGE_DIR) / "base_model.py"),
+    str(Path(_PACKAGE_DIR) / "query_wrapper.py"),
+    str(Path(_PACKAGE_DIR) / "mixins"),
+)
+"source files whose methods are reported as the caller of a statement"
+
+
+class QueryLogEntry:
+    __slots__ = ("caller", "duration", "fingerprint", "params_count", "rows", "sql")
+
+    def __init__(
+        self,
+        *,
+        sql: str,
+        fingerprint: str,
+        params_count: int,
+        rows: int | None,
+        duration: float,
+        caller: str | None,
+    ):
+        self.sql = sql
+        self.fingerprint = fingerprint
+        self.params_count = params_count
+        "number of bound parameter values sent with the statement"
+        self.rows = rows
+        "rows returned or affected, None when the driver does not know (server-side cursors)"
+        self.duration = duration
+        "seconds spent executing the statement, not including fetching the rows"
+        self.caller = caller
+        "the activemodel method which issued the statement, e.g. `BaseModel.get` or `QueryWrapper.all`"
+
+    def __repr__(self) -> str:
+        return f"QueryLogEntry(caller={self.caller!r}, duration={self.duration:.6f}, sql={self.fingerprint!r})"
+
+
+class QueryLog:
+    def __init__(self, *, sampled: bool = True):
+        self.sampled = sampled
+        "False when this block was skipped by `sample_rate`, in which case nothing is recorded"
+
+        self.entries: list[QueryLogEntry] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.entries)
+
+    @property
+    def duration(self) -> float:
+        "total seconds spent executing statements"
+        return sum(entry.duration for entry in self.entries)
+
+    def by_fingerprint(self) -> dict[str, dict[str, t.Any]]:
+        "totals per normalized statement, slowest first"
+
+        totals: dict[str, dict[str, t.Any]] = {}
+
+        for entry in self.entries:
+            total = totals.setdefault(
+                entry.fingerprint,
+                {"count": 0, "duration": 0.0, "rows": 0, "callers": set()},
+            )
+            total["count"] += 1
+            total["duration"] += entry.duration
+            total["rows"] += entry.rows or 0
+
+            if entry.caller:
+                total["callers"].add(entry.caller)
+
+        return dict(
+            sorted(totals.items(), key=lambda item: item[1]["duration"], reverse=True)
+        )
+
+    def _record(self, entry: QueryLogEntry) -> None:
+        # statements can be recorded from threads sharing the context, e.g. a threadpool running a sync endpoint
+        with self._lock:
+            self.entries.append(entry)
+
+
+_active_query_logs = contextvars.ContextVar[tuple[QueryLog, ...]](
+    "active_query_logs", default=()
+)
+"""
+Query logs collecting statements in the current context, innermost last.
+
+Like the other activemodel ContextVars, this must be defined at the top-level of the module.
+"""
+
+
+@contextlib.contextmanager
+def query_log(*, sample_rate: float = 1.0) -> t.Iterator[QueryLog]:
+    """
+    Record every statement executed inside the block, including statements issued by hooks and async methods.
+
+    Blocks can be nested, each log records the statements executed within it. Pass `sample_rate` to only record a
+    fraction of blocks, e.g. in a middleware running on every production request. Skipped blocks yield a log with
+    `sampled=False` and add no overhead.
+    """
+
+    assert 0 <= sample_rate <= 1, "sample_rate must be between 0 and 1"
+
+    if sample_rate < 1 and random.random() >= sample_rate:
+        yield QueryLog(sampled=False)
+        return
+
+    log = QueryLog()
+    token = _active_query_logs.set((*_active_query_logs.get(), log))
+
+    try:
+        yield log
+    finally:
+        _active_query_logs.reset(token)
+
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2_048)
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a statement so executions differing only in values (or in the length of IN lists and multi-row
+    VALUES) share a fingerprint.
+    """
+
+    normalized = _PLACEHOLDER.sub("?", sql)
+    normalized = _LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    normalized = _VALUES_ROWS.sub("VALUES (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _params_count(parameters, executemany: bool) -> int:
+    if not parameters:
+        return 0
+
+    if executemany:
+        return sum(len(parameter_set) for parameter_set in parameters)
+
+    return len(parameters)
+
+
+def _calling_method() -> str | None:
+    """
+    Find the activemodel method which issued the current statement by walking up the stack.
+
+    Stops at the first frame outside of activemodel once a model method was found, so a statement issued by a hook
+    is attributed to the finder the hook called, not the `save()` which ran the hook.
+    """
+
+    frame = sys._getframe(2)
+    method = None
+
+    while frame is not None:
+        filename = frame.f_code.co_filename
+
+        if filename.startswith(_MODEL_FILES):
+            method = frame.f_code.co_qualname
+        elif method is not None and not filename.startswith(_PACKAGE_DIR):
+            break
+
+        frame = frame.f_back
+
+    return method
+
+
+def attach(engine: Engine) -> None:
+    "record the statements executed by `engine` in the active query logs"
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if _active_query_logs.get():
+            context._query_log_started_at = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not (logs := _active_query_logs.get()):
+            return
+
+        started_at = getattr(context, "_query_log_started_at", None)
+
+        if started_at is None:
+            return
+
+        rowcount = cursor.rowcount
+        entry = QueryLogEntry(
+            sql=statement,
+            fingerprint=fingerprint(statement),
+            params_count=_params_count(parameters, executemany),
+            rows=rowcount if rowcount >= 0 else None,
+            duration=time.perf_counter() - started_at,
+            caller=_calling_method(),
+        )
+
+        for log in logs:
+            log._record(entry)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
@@ -1,15 +1,50 @@
 import contextlib
+import dataclasses
+import random
 import typing as t
+import uuid
+from functools import partial
 from typing import overload
 
+import sqlalchemy as sa
 import sqlmodel as sm
+from pydantic import BaseModel as PydanticBaseModel
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from sqlmodel.sql.expression import SelectOfScalar
+from typeid import TypeID
 
 from activemodel.types.sqlalchemy_protocol import SQLAlchemyQueryMethods
 
-from .session_manager import get_session
+from .estimates import (
+    query_row_estimate,
+    supports_estimates,
+    table_row_estimate,
+    table_size_estimate,
+)
+from .mixins.cached import CachedModelMixin
+from .session_manager import (
+    _commit_or_flush,
+    _run_in_async_session,
+    get_async_session,
+    get_session,
+)
 from .utils import compile_sql
 
+type SynchronizeSession = t.Literal["auto", "evaluate", "fetch", False]
+
+type SampleStrategy = t.Literal[
+    "auto", "random", "system", "bernoulli", "key", "reservoir"
+]
+
+SORT_SAMPLE_MAX_ROWS = 50_000
+"`sample()` picks rows with `ORDER BY random()` from tables estimated below this size"
+
+TABLESAMPLE_MIN_PAGES = 10
+"`system` sampling selects at least this many pages, so an empty sample is unlikely even when `n` is tiny"
+
+TABLESAMPLE_RETRIES = 2
+"times a short TABLESAMPLE is retried with a 10x larger percentage before falling back to `reservoir`"
+
 
 class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
     """
@@ -22,6 +57,8 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
     def __init__(self, cls: type[TModel], *args: t.Any) -> None:
         self._model_cls = cls
         self._no_autoflush = False
+        # joined eager loads of collections return duplicate parent rows which must be uniqued
+        self._unique = False
 
         # TODO add generics here
         # self.target: SelectOfScalar[T] = sql.select(cls)
@@ -62,41 +99,302 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
         self._no_autoflush = True
         return self
 
+    def includes(self, *paths: str) -> t.Self:
+        """
+        Eager load relationships by name, nested relationships are separated by dots:
+
+        >>> Post.select().includes("author", "comments.tags")
+
+        Many-to-one relationships are loaded with a JOIN (`eager_load()`), collections with a separate
+        `WHERE ... IN` query (`preload()`) so the parent rows are not multiplied.
+        """
+
+        return self._eager_load_paths(paths, strategy=None)
+
+    def preload(self, *paths: str) -> t.Self:
+        "eager load relationships with one additional `SELECT ... WHERE id IN (...)` per relationship"
+
+        return self._eager_load_paths(paths, strategy=selectinload)
+
+    def eager_load(self, *paths: str) -> t.Self:
+        "eager load relationships with a LEFT OUTER JOIN in the same query"
+
+        return self._eager_load_paths(paths, strategy=joinedload)
+
+    def _eager_load_paths(
+        self, paths: tuple[str, ...], strategy: t.Callable | None
+    ) -> t.Self:
+        assert paths, "at least one relationship path is required"
+
+        options = [self._loader_option(path, strategy) for path in paths]
+        self.target = self.target.options(*options)
+        return self
+
+    def _loader_option(self, path: str, strategy: t.Callable | None):
+        "build a loader option for a dotted relationship path, raising ValueError for unknown relationships"
+
+        mapper = sa.inspect(self._model_cls)
+        option = None
+
+        for name in path.split("."):
+            relationship = mapper.relationships.get(name)
+
+            if relationship is None:
+                raise ValueError(
+                    f"{mapper.class_.__name__} has no relationship '{name}' (in '{path}'), "
+                    f"available relationships: {', '.join(mapper.relationships.keys()) or 'none'}"
+                )
+
+            attribute = relationship.class_attribute
+            loader = strategy or (selectinload if relationship.uselist else joinedload)
+
+            if loader is joinedload and relationship.uselist:
+                self._unique = True
+
+            if option is None:
+                option = loader(attribute)
+            else:
+                option = getattr(option, loader.__name__)(attribute)
+
+            mapper = relationship.mapper
+
+        assert option is not None
+        return option
+
+    def _exec(self, session, statement):
+        result = session.exec(statement)
+        return result.unique() if self._unique else result
+
     def first(self):
         pk_attr = self._pk_attr()
         stmt = self.target.order_by(pk_attr.desc()).limit(1)
         with self._get_session() as session:
-            result = session.exec(stmt).first()
+            result = self._exec(session, stmt).first()
             return self._run_after_load_hooks(result)
 
     def last(self):
         pk_attr = self._pk_attr()
         stmt = self.target.order_by(pk_attr.asc()).limit(1)
         with self._get_session() as session:
-            result = session.exec(stmt).first()
+            result = self._exec(session, stmt).first()
             return self._run_after_load_hooks(result)
 
     def one(self):
         "requires exactly one result in the dataset"
         with self._get_session() as session:
-            result = session.exec(self.target).one()
+            result = self._exec(session, self.target).one()
             return self._run_after_load_hooks(result)
 
     def all(self):
         with self._get_session() as session:
-            result = session.exec(self.target)
+            result = self._exec(session, self.target)
             for row in result:
                 yield self._run_after_load_hooks(row)
 
-    def count(self):
+    def stream(
+        self, yield_per: int = 1_000, *, expunge: bool = False
+    ) -> t.Iterator[TModel]:
+        """
+        Iterate over the query using a server-side cursor.
+
+        `all()` lets the driver buffer the entire result set before the first row is returned. `stream()` fetches
+        `yield_per` rows at a time from a server-side (named) cursor, so the first record is available immediately
+        and memory is bounded by `yield_per`. Unlike `find_each()`, the whole iteration reads from a single
+        consistent snapshot.
+
+        Pass `expunge=True` to remove each instance from the session once the consumer moves on to the next one.
+        """
+
+        assert yield_per > 0, "yield_per must be greater than 0"
+
+        # `yield_per` implies `stream_results`, which asks the driver for a server-side cursor
+        stmt = self.target.execution_options(yield_per=yield_per)
+
+        with self._get_session() as session:
+            for row in session.exec(stmt):
+                instance = self._run_after_load_hooks(row)
+                yield instance
+
+                if expunge and instance in session:
+                    session.expunge(instance)
+
+    def in_batches(self, batch_size: int = 1_000) -> t.Iterator[list[TModel]]:
+        """
+        Iterate over the query in lists of `batch_size` records, paging by primary key.
+
+        Each batch is loaded with a keyset predicate (`WHERE id > :last_id ORDER BY id LIMIT :batch_size`) instead of
+        OFFSET, so every page is an index range scan. After a batch has been consumed its instances are expunged
+        from the session, which keeps memory flat even when iterating over a huge table inside `global_session()`.
+        Unsaved changes to a batch's instances are discarded when the next batch is loaded.
+
+        Any ordering on the query is replaced by primary key ordering. TypeID (UUIDv7) primary keys sort by
+        creation time.
+        """
+
+        assert batch_size > 0, "batch_size must be greater than 0"
+
+        pk_attr = self._pk_attr()
+        base_stmt = self.target.order_by(None).order_by(pk_attr.asc()).limit(batch_size)
+        last_pk = None
+
+        while True:
+            stmt = base_stmt if last_pk is None else base_stmt.where(pk_attr > last_pk)
+
+            with self._get_session() as session:
+                batch = [
+                    self._run_after_load_hooks(row) for row in self._exec(session, stmt)
+                ]
+
+                if not batch:
+                    return
+
+                yield t.cast(list[TModel], batch)
+
+                # drop the batch from the identity map so a long-lived session does not grow unbounded
+                for instance in batch:
+                    if instance in session:
+                        session.expunge(instance)
+
+            if len(batch) < batch_size:
+                return
+
+            last_pk = getattr(batch[-1], pk_attr.key)
+
+    def find_each(self, batch_size: int = 1_000) -> t.Iterator[TModel]:
+        """
+        Iterate over every record of the query while only holding `batch_size` records in memory.
+
+        See `in_batches()` for how records are paged.
+        """
+
+        for batch in self.in_batches(batch_size):
+            yield from batch
+
+    def count(self, *, estimate: bool = False):
         """
         I did some basic tests
+
+        Pass `estimate=True` to use the Postgres planner's row estimate instead of counting: the table statistics
+        when the query has no filters, otherwise the `EXPLAIN` estimate of the query. Estimates below the model's
+        `__count_estimate_threshold__` are replaced by an exact count.
+        """
+        with self._get_session() as session:
+            if estimate and supports_estimates(session, self._model_cls):
+                approximate = self._row_estimate(session)
+                threshold = getattr(self._model_cls, "__count_estimate_threshold__", 0)
+
+                if approximate is not None and approximate >= threshold:
+                    return approximate
+
+            return (
+                session.scalar(
+                    sm.select(sm.func.count()).select_from(self.target.subquery())
+                )
+                or 0
+            )
+
+    def _is_unfiltered(self) -> bool:
+        "True when the query selects every row of the table, in any order"
+
+        # loader options (`includes()` etc) change how rows are loaded, not which rows match
+        unfiltered = sm.select(self._model_cls).options(*self.target._with_options)
+        return self.target.order_by(None).compare(unfiltered)
+
+    def _row_estimate(self, session) -> int | None:
+        if self._is_unfiltered():
+            return table_row_estimate(session, self._model_cls)
+
+        return query_row_estimate(session, self._model_cls, self.target)
+
+    def pluck(self, *columns: str | t.Any) -> list[t.Any]:
+        """
+        Select only the given columns, returning a list of values for a single column or tuples for several:
+
+        >>> User.where(User.active == True).pluck("email")
+        ['a@example.com', ...]
+        >>> User.select().pluck("id", "email")
+        [(TypeID(...), 'a@example.com'), ...]
+
+        Rows are never hydrated into model instances, so no lifecycle hooks or JSON rehydration run. Columns are
+        column names of the model or SQL expressions.
+        """
+
+        assert columns, "at least one column is required"
+
+        selected = [self._column_attribute(column) for column in columns]
+        stmt = self.target.with_only_columns(*selected)
+
+        with self._get_session() as session:
+            result = session.execute(stmt)
+
+            if len(selected) == 1:
+                return list(result.scalars())
+
+            return [tuple(row) for row in result]
+
+    def ids(self) -> list[t.Any]:
+        "primary keys of the matching records, without loading the records"
+
+        return self.pluck(self._pk_attr())
+
+    def as_[S](self, schema: type[S], *, validate: bool = True) -> list[S]:
+        """
+        Load the matching rows straight into a Pydantic model or dataclass, selecting only the columns it declares:
+
+        >>> User.where(User.active == True).as_(UserResponse)
+        [UserResponse(id=TypeID(...), email='a@example.com'), ...]
+
+        Field names must match column names. Fields which are not columns are left to their defaults. Values are
+        converted by the column types (TypeIDs, whenever datetimes, etc) exactly like model attributes, but no model
+        instances, identity map entries or lifecycle hooks are involved.
+
+        Pydantic schemas are validated, which turns JSON columns into nested models. Pass `validate=False` to build
+        them with `model_construct()` when the column values already have the right types.
         """
+
+        mapper = sa.inspect(self._model_cls)
+        field_names = _schema_fields(schema)
+        names = [name for name in field_names if name in mapper.column_attrs]
+
+        for name, required in field_names.items():
+            if required and name not in mapper.column_attrs:
+                raise ValueError(
+                    f"{schema.__name__}.{name} is required but {self._model_cls.__name__} has no column '{name}'"
+                )
+
+        assert names, (
+            f"{schema.__name__} declares no columns of {self._model_cls.__name__}"
+        )
+
+        stmt = self.target.with_only_columns(
+            *[getattr(self._model_cls, name) for name in names]
+        )
+
         with self._get_session() as session:
-            return session.scalar(
-                sm.select(sm.func.count()).select_from(self.target.subquery())
+            rows = session.execute(stmt)
+
+            if issubclass(schema, PydanticBaseModel) and validate:
+                return [schema.model_validate(dict(zip(names, row))) for row in rows]
+
+            if issubclass(schema, PydanticBaseModel):
+                return [schema.model_construct(**dict(zip(names, row))) for row in rows]
+
+            return [schema(**dict(zip(names, row))) for row in rows]
+
+    def _column_attribute(self, column: str | t.Any):
+        if not isinstance(column, str):
+            return column
+
+        mapper = sa.inspect(self._model_cls)
+
+        if column not in mapper.column_attrs:
+            raise ValueError(
+                f"{self._model_cls.__name__} has no column '{column}', "
+                f"available columns: {', '.join(mapper.column_attrs.keys())}"
             )
 
+        return getattr(self._model_cls, column)
+
     # TODO typing is broken here
     # TODO would be great to define a default return type if nothing is found
     def scalar(self):
@@ -108,11 +406,190 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
 
     def exec(self):
         with self._get_session() as session:
-            return session.exec(self.target)
+            return self._exec(session, self.target)
+
+    @overload
+    def update_all(
+        self,
+        *,
+        returning: t.Literal[False] = False,
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+        **values: t.Any,
+    ) -> int: ...
+
+    @overload
+    def update_all(
+        self,
+        *,
+        returning: t.Literal[True],
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+        **values: t.Any,
+    ) -> list[TModel]: ...
+
+    def update_all(
+        self,
+        *,
+        returning: bool = False,
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+        **values: t.Any,
+    ) -> int | list[TModel]:
+        """
+        Update every matching record with a single `UPDATE ... WHERE`, without loading the records:
+
+        >>> User.where(User.last_seen_at < cutoff).update_all(active=False)
+        42
+
+        Returns the number of updated rows, or the updated records when `returning=True` (via `RETURNING`).
+
+        `synchronize_session` controls how records already loaded in the session are updated: `auto`, `evaluate`
+        (apply the values in Python to the matching loaded records), `fetch` (use `RETURNING` to find them) or
+        `False` to leave them stale.
+
+        Lifecycle hooks are skipped. Pass `run_hooks=True` to load the records and `save()` each of them instead,
+        which runs the update and save hooks but issues one UPDATE per record.
+        """
+
+        assert values, "update_all requires at least one value"
+
+        for name in values:
+            self._column_attribute(name)
+
+        if run_hooks:
+            return self._update_with_hooks(values, returning=returning)
+
+        stmt = sa.update(self._model_cls).where(self._dml_criteria()).values(**values)
+        return self._execute_dml(
+            stmt, returning=returning, synchronize_session=synchronize_session
+        )
+
+    @overload
+    def delete_all(
+        self,
+        *,
+        returning: t.Literal[False] = False,
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+    ) -> int: ...
+
+    @overload
+    def delete_all(
+        self,
+        *,
+        returning: t.Literal[True],
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+    ) -> list[TModel]: ...
+
+    def delete_all(
+        self,
+        *,
+        returning: bool = False,
+        synchronize_session: SynchronizeSession = "auto",
+        run_hooks: bool = False,
+    ) -> int | list[TModel]:
+        """
+        Delete every matching record with a single `DELETE ... WHERE`, without loading the records.
+
+        Returns the number of deleted rows, or the deleted records when `returning=True`. See `update_all()` for
+        `synchronize_session`. Pass `run_hooks=True` to load the records and run the delete hooks for each of them.
+        """
+
+        if run_hooks:
+            return self._delete_with_hooks(returning=returning)
+
+        stmt = sa.delete(self._model_cls).where(self._dml_criteria())
+        return self._execute_dml(
+            stmt, returning=returning, synchronize_session=synchronize_session
+        )
+
+    def delete(self) -> int:
+        "delete every matching record, see `delete_all()`"
+        return self.delete_all()
+
+    def _dml_criteria(self):
+        "WHERE clause selecting the rows of this query for an UPDATE or DELETE"
+
+        whereclause = self.target.whereclause
+        plain_select = sm.select(self._model_cls)
+
+        if whereclause is not None:
+            plain_select = plain_select.where(whereclause)
+
+        # joins, limits, grouping, etc can't be expressed on an UPDATE/DELETE, match the primary keys instead
+        if not self.target.order_by(None).compare(plain_select):
+            pk_attr = self._pk_attr()
+            return pk_attr.in_(self.target.with_only_columns(pk_attr).order_by(None))
+
+        return sa.true() if whereclause is None else whereclause
+
+    def _execute_dml(
+        self,
+        stmt,
+        *,
+        returning: bool,
+        synchronize_session: SynchronizeSession,
+    ) -> int | list[TModel]:
+        model_cls = t.cast(t.Any, self._model_cls)
+        is_cached = issubclass(model_cls, CachedModelMixin)
+        pk_attr = self._pk_attr()
+
+        if returning:
+            stmt = stmt.returning(model_cls)
+        elif is_cached:
+            # the primary keys are needed to drop the records from the cache
+            stmt = stmt.returning(pk_attr)
 
-    def delete(self):
         with self._get_session() as session:
-            return session.delete(self.target)
+            result = session.execute(
+                stmt, execution_options={"synchronize_session": synchronize_session}
+            )
+
+            rows: list[TModel] = []
+
+            if returning:
+                rows = list(result.scalars())
+                keys = [getattr(row, pk_attr.key) for row in rows]
+            elif is_cached:
+                keys = list(result.scalars())
+            else:
+                keys = None
+
+            # keep the returned records loaded, like `insert_all()`
+            _commit_or_flush(session, preserve_loaded_state=True)
+
+        if keys is not None:
+            model_cls._expire_cached(keys)
+
+        if returning:
+            return rows
+
+        return (
+            len(keys) if keys is not None else t.cast(sa.CursorResult, result).rowcount
+        )
+
+    def _update_with_hooks(
+        self, values: dict[str, t.Any], *, returning: bool
+    ) -> int | list[TModel]:
+        updated = list(self.all())
+
+        for instance in updated:
+            for name, value in values.items():
+                setattr(instance, name, value)
+
+            t.cast(t.Any, instance).save()
+
+        return updated if returning else len(updated)
+
+    def _delete_with_hooks(self, *, returning: bool) -> int | list[TModel]:
+        deleted = list(self.all())
+
+        for instance in deleted:
+            t.cast(t.Any, instance).delete()
+
+        return deleted if returning else len(deleted)
 
     def exists(self) -> bool:
         """Return True if the current query yields at least one row.
@@ -127,6 +604,67 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
             result = session.scalar(exists_stmt)
             return bool(result)
 
+    # async counterparts run the sync methods above on an `AsyncSession`, see `_run_in_async_session`
+
+    async def afirst(self) -> TModel | None:
+        return await _run_in_async_session(self.first)
+
+    async def alast(self) -> TModel | None:
+        return await _run_in_async_session(self.last)
+
+    async def aone(self) -> TModel:
+        return await _run_in_async_session(self.one)
+
+    async def aall(self) -> list[TModel]:
+        return await _run_in_async_session(lambda: list(self.all()))
+
+    async def acount(self, *, estimate: bool = False) -> int:
+        return await _run_in_async_session(partial(self.count, estimate=estimate))
+
+    async def aexists(self) -> bool:
+        return await _run_in_async_session(self.exists)
+
+    async def apluck(self, *columns: str | t.Any) -> list[t.Any]:
+        return await _run_in_async_session(partial(self.pluck, *columns))
+
+    async def aids(self) -> list[t.Any]:
+        return await _run_in_async_session(self.ids)
+
+    async def ascalar(self):
+        return await _run_in_async_session(self.scalar)
+
+    async def astream(self, yield_per: int = 1_000) -> t.AsyncIterator[TModel]:
+        """
+        Async version of `stream()`: iterate over the query with a server-side cursor without blocking the event loop.
+
+        `async for record in query` is shorthand for `query.astream()`.
+        """
+
+        assert yield_per > 0, "yield_per must be greater than 0"
+
+        stmt = self.target.execution_options(yield_per=yield_per)
+
+        model_hooks = getattr(self._model_cls, "__lifecycle_hooks__", {})
+        has_load_hooks = (
+            "after_find" in model_hooks or "after_initialize" in model_hooks
+        )
+
+        async with get_async_session() as session:
+            result = await session.stream(stmt)
+            rows = result.scalars() if isinstance(stmt, SelectOfScalar) else result
+
+            async for row in rows:
+                # hooks may lazy load relationships, which needs the greenlet `run_sync` provides
+                if has_load_hooks:
+                    row = await session.run_sync(
+                        lambda _, row=row: self._run_after_load_hooks(row)
+                    )
+
+                yield t.cast(TModel, row)
+
+    def __aiter__(self) -> t.AsyncIterator[TModel]:
+        return self.astream()
+
     def __getattr__(self, name):
         """
         This implements the magic that forwards function calls to sqlalchemy.
@@ -160,25 +698,41 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
         return compile_sql(self.target)
 
     @overload
-    def sample(self) -> TModel | None: ...
+    def sample(self, *, strategy: SampleStrategy = "auto") -> TModel | None: ...
 
     @overload
-    def sample(self, n: int) -> list[TModel]: ...
+    def sample(self, n: int, *, strategy: SampleStrategy = "auto") -> list[TModel]: ...
 
-    def sample(self, n: int = 1) -> TModel | None | list[TModel]:
+    def sample(
+        self, n: int = 1, *, strategy: SampleStrategy = "auto"
+    ) -> TModel | None | list[TModel]:
         """Return a random sample of rows from the current query.
 
         Parameters
         ----------
         n: int
             Number of rows to return. Defaults to 1.
+        strategy: str
+            How rows are picked:
+
+            - ``random``: ``ORDER BY random() LIMIT n``. Exact, but sorts every matching row.
+            - ``system`` / ``bernoulli``: ``TABLESAMPLE`` of the table, for queries without filters. ``system``
+              reads a few random pages, so rows stored next to each other tend to be sampled together.
+              ``bernoulli`` picks individual rows but scans the whole table. A sample with fewer than ``n`` rows
+              is retried with a larger percentage, then falls back to ``reservoir``.
+            - ``key``: probe random primary keys between the smallest and largest matching key, one index lookup
+              per row. Requires an integer, UUID or TypeID primary key. Records following a gap in the key space
+              (for UUIDv7/TypeID keys, records created after a quiet period) are more likely to be picked.
+            - ``reservoir``: stream the matching primary keys in keyset-paginated batches, keep a uniform
+              sample of ``n`` of them and load those records. Reads every matching key, but never sorts and keeps
+              only ``n`` keys in memory.
+            - ``auto`` (default): ``random`` for small tables, ``system`` for queries without filters and
+              ``reservoir`` otherwise.
 
         Behavior
         --------
         - Returns a single model instance when ``n == 1`` (or ``None`` if no rows)
         - Returns a list[Model] when ``n > 1`` (possibly empty list when no rows)
-        - Sampling is performed by appending an ``ORDER BY RANDOM()`` / ``func.random()``
-          and ``LIMIT n`` clause to the existing query target.
         - Keeps original query intact (does not mutate ``self.target``) so further
           chaining works as expected.
         """
@@ -186,11 +740,21 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
         if n < 1:
             raise ValueError("n must be >= 1")
 
-        # Build a new randomized limited query leaving self.target untouched
-        randomized = self.target.order_by(sm.func.random()).limit(n)
+        if strategy not in t.get_args(SampleStrategy.__value__):
+            raise ValueError(f"Unknown sample strategy: {strategy}")
 
         with self._get_session() as session:
-            result = list(session.exec(randomized))
+            if strategy == "auto":
+                strategy = self._sample_strategy(session)
+
+            if strategy in ("system", "bernoulli"):
+                result = self._sample_tablesample(session, n, strategy)
+            elif strategy == "key":
+                result = self._sample_keys(session, n)
+            elif strategy == "reservoir":
+                result = self._sample_reservoir(session, n)
+            else:
+                result = self._sample_random(session, n)
 
         processed_result = [self._run_after_load_hooks(row) for row in result]
 
@@ -199,6 +763,206 @@ class QueryWrapper[TModel: sm.SQLModel](SQLAlchemyQueryMethods[TModel]):
         else:
             return processed_result
 
+    def _sample_strategy(self, session) -> SampleStrategy:
+        if not supports_estimates(session, self._model_cls):
+            return "random"
+
+        estimate = table_row_estimate(session, self._model_cls)
+
+        # sorting a small table is cheap, and the only exact strategy
+        if estimate is None or estimate < SORT_SAMPLE_MAX_ROWS:
+            return "random"
+
+        if self._is_unfiltered():
+            return "system"
+
+        return "reservoir"
+
+    def _sample_random(self, session, n: int) -> list[TModel]:
+        # Build a new randomized limited query leaving self.target untouched
+        randomized = self.target.order_by(sm.func.random()).limit(n)
+        return list(self._exec(session, randomized))
+
+    def _sample_tablesample(
+        self, session, n: int, method: t.Literal["system", "bernoulli"]
+    ) -> list[TModel]:
+        if not self._is_unfiltered():
+            raise ValueError(
+                "TABLESAMPLE can only sample queries without filters, use the 'key' or 'reservoir' strategy"
+            )
+
+        pk_attr = self._pk_attr()
+        size = table_size_estimate(session, self._model_cls)
+        percent = _tablesample_percent(n, method, *size) if size else 100.0
+
+        for _ in range(TABLESAMPLE_RETRIES + 1):
+            sampled_table = sa.tablesample(
+                sa.inspect(self._model_cls).local_table,
+                getattr(sa.func, method)(percent),
+            )
+            sampled_model = aliased(self._model_cls, sampled_table)
+            sampled_keys = (
+                sm.select(getattr(sampled_model, pk_attr.key))
+                .order_by(sm.func.random())
+                .limit(n)
+            )
+
+            # load the sampled keys through the query so its loader options apply to them
+            rows = list(
+                self._exec(
+                    session, self.target.order_by(None).where(pk_attr.in_(sampled_keys))
+                )
+            )
+
+            # sampling the whole table is exact, it has fewer than `n` rows
+            if len(rows) == n or percent >= 100.0:
+                random.shuffle(rows)
+                return rows
+
+            percent = min(100.0, percent * 10)
+
+        # statistics are far off, sampling more of the table would approach a full scan anyway
+        return self._sample_reservoir(session, n)
+
+    def _sample_keys(self, session, n: int) -> list[TModel]:
+        pk_attr = self._pk_attr()
+        # postgres has no min()/max() for uuids, ordering by the primary key is an index lookup either way
+        keys_stmt = self.target.with_only_columns(pk_attr).order_by(None).limit(1)
+        low = session.scalar(keys_stmt.order_by(pk_attr.asc()))
+        high = session.scalar(keys_stmt.order_by(pk_attr.desc()))
+
+        if low is None:
+            return []
+
+        low_int, high_int = _key_to_int(low), _key_to_int(high)
+        key_from_int = _key_from_int(low)
+        probe_stmt = self.target.order_by(None).order_by(pk_attr.asc()).limit(1)
+
+        found: dict[t.Any, TModel] = {}
+
+        # duplicates are likely once `n` approaches the number of matching rows, stop after a fixed number of probes
+        for _ in range(n * 3):
+            if len(found) == n:
+                break
+
+            probe = key_from_int(random.randint(low_int, high_int))
+            row = self._exec(session, probe_stmt.where(pk_attr >= probe)).first()
+
+            if row is not None:
+                found[getattr(row, pk_attr.key)] = row
+
+        return list(found.values())
+
+    def _sample_reservoir(
+        self, session, n: int, batch_size: int = 10_000
+    ) -> list[TModel]:
+        pk_attr = self._pk_attr()
+        keys_stmt = (
+            self.target.with_only_columns(pk_attr)
+            .order_by(None)
+            .order_by(pk_attr.asc())
+            .limit(batch_size)
+        )
+
+        reservoir: list[t.Any] = []
+        seen = 0
+        last_key = None
+
+        while True:
+            stmt = (
+                keys_stmt if last_key is None else keys_stmt.where(pk_attr > last_key)
+            )
+            keys = list(session.execute(stmt).scalars())
+
+            # algorithm R: the i-th key replaces a random sampled key with probability n / i
+            for key in keys:
+                seen += 1
+
+                if len(reservoir) < n:
+                    reservoir.append(key)
+                elif (index := random.randrange(seen)) < n:
+                    reservoir[index] = key
+
+            if len(keys) < batch_size:
+                break
+
+            last_key = keys[-1]
+
+        if not reservoir:
+            return []
+
+        rows = list(
+            self._exec(
+                session, self.target.order_by(None).where(pk_attr.in_(reservoir))
+            )
+        )
+        random.shuffle(rows)
+        return rows
+
     def __repr__(self) -> str:
         # TODO we should improve structure of this a bit more, maybe wrap in <> or something?
         return f"{self.__class__.__name__}: Current SQL:\n{self.sql()}"
+
+
+def _tablesample_percent(
+    n: int, method: t.Literal["system", "bernoulli"], rows: int, pages: int
+) -> float:
+    "percentage of the table to TABLESAMPLE for about 10x `n` rows, both methods only approximate the percentage"
+
+    if not rows or not pages:
+        return 100.0
+
+    wanted_rows = n * 10
+
+    if method == "system":
+        # `system` picks whole pages, a percentage of rows would round down to no pages on large tables
+        wanted_pages = max(wanted_rows / (rows / pages), TABLESAMPLE_MIN_PAGES)
+        percent = wanted_pages / pages * 100
+    else:
+        percent = wanted_rows / rows * 100
+
+    return min(100.0, percent)
+
+
+def _schema_fields(schema: type) -> dict[str, bool]:
+    "field names of a Pydantic model or dataclass, mapped to whether the field is required"
+
+    if issubclass(schema, PydanticBaseModel):
+        return {
+            name: field.is_required() for name, field in schema.model_fields.items()
+        }
+
+    if dataclasses.is_dataclass(schema):
+        return {
+            field.name: field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING
+            for field in dataclasses.fields(schema)
+            if field.init
+        }
+
+    raise TypeError(f"{schema!r} must be a Pydantic model or a dataclass")
+
+
+def _key_to_int(key: t.Any) -> int:
+    if isinstance(key, int):
+        return key
+
+    if isinstance(key, TypeID):
+        return key.uuid.int
+
+    if isinstance(key, uuid.UUID):
+        return key.int
+
+    raise ValueError(
+        f"key sampling requires an integer, UUID or TypeID primary key, not {type(key).__name__}"
+    )
+
+
+def _key_from_int(example: t.Any) -> t.Callable[[int], t.Any]:
+    "convert sampled integers back to keys of the same type as `example`"
+
+    if isinstance(example, int):
+        return int
+
+    # TypeID columns bind plain UUIDs
+    return lambda value: uuid.UUID(int=value)
@@ -0,0 +1,208 @@
+"""
+Route statements to the right database: named databases for models declaring `__database__`, and read replicas for
+reads while writes go to the primary.
+
+Routing happens in `RoutingSession.get_bind`, which SQLAlchemy calls for every statement a session executes, so
+finders, the QueryWrapper and lazy loads are routed without any changes to the model methods.
+"""
+
+import contextvars
+import random
+import threading
+import time
+import typing as t
+
+import sqlalchemy as sa
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+
+from .logger import logger
+from .query_log import attach as attach_query_log
+
+if t.TYPE_CHECKING:
+    from .session_manager import SessionManager
+
+
+class Replica:
+    """
+    A read replica and its health. Engines are created on first use.
+
+    A replica is skipped for `retry_interval` seconds after a connection to it fails, then tried again.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        weight: float,
+        engine_options: dict[str, t.Any],
+        retry_interval: float,
+    ):
+        assert weight >= 0, "replica weight must not be negative"
+
+        self.database_url = database_url
+        self.weight = weight
+        self.retry_interval = retry_interval
+
+        self._engine_options = engine_options
+        self._engine: Engine | None = None
+        self._async_engine: AsyncEngine | None = None
+        self._unhealthy_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._unhealthy_until
+
+    def mark_unhealthy(self) -> None:
+        if self.healthy:
+            logger.warning(
+                "replica unavailable, routing reads to other databases for %ss",
+                self.retry_interval,
+            )
+
+        self._unhealthy_until = time.monotonic() + self.retry_interval
+
+    def mark_healthy(self) -> None:
+        self._unhealthy_until = 0.0
+
+    def get_engine(self) -> Engine:
+        with self._lock:
+            if not self._engine:
+                self._engine = create_engine(self.database_url, **self._engine_options)
+                self._watch_connection_errors(self._engine)
+                attach_query_log(self._engine)
+
+        return self._engine
+
+    def get_async_engine(self) -> AsyncEngine:
+        with self._lock:
+            if not self._async_engine:
+                self._async_engine = create_async_engine(
+                    self.database_url, **self._engine_options
+                )
+                self._watch_connection_errors(self._async_engine.sync_engine)
+                attach_query_log(self._async_engine.sync_engine)
+
+        return self._async_engine
+
+    def check(self) -> bool:
+        "run `SELECT 1` against the replica and record the result"
+
+        try:
+            with self.get_engine().connect() as connection:
+                connection.execute(sa.text("SELECT 1"))
+        except DBAPIError:
+            self.mark_unhealthy()
+            return False
+
+        self.mark_healthy()
+        return True
+
+    def _watch_connection_errors(self, engine: Engine) -> None:
+        def handle_error(context: sa.engine.ExceptionContext):
+            # `connection` is None when the error happened while connecting
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy()
+
+        event.listen(engine, "handle_error", handle_error)
+
+
+def choose_replica(replicas: list[Replica]) -> Replica | None:
+    "weighted random choice among healthy replicas, None if there are none"
+
+    candidates = [
+        replica for replica in replicas if replica.weight > 0 and replica.healthy
+    ]
+
+    if not candidates:
+        return None
+
+    return random.choices(
+        candidates, weights=[replica.weight for replica in candidates]
+    )[0]
+
+
+_last_write_at = contextvars.ContextVar[float | None]("last_write_at", default=None)
+"""
+Monotonic time of the last write made in this context, used to keep reads on the primary for the sticky window.
+
+Like the other activemodel ContextVars, this must be defined at the top-level of the module.
+"""
+
+
+class RoutingSession(Session):
+    """
+    Pick the database for every statement: models declaring `__database__` use that named `SessionManager`, and
+    plain SELECTs go to a replica of the manager when it has any. Everything else (flushes, DML,
+    `SELECT ... FOR UPDATE`, raw SQL) goes to the primary.
+
+    A session sticks to the primary after its first write, so a `global_session()` reads its own writes, and a
+    `transaction()` block reads from the primary from its start. New sessions also read from the primary for
+    `replica_sticky_window` seconds after a write made in the same context (request, task, etc). A session reads from
+    a single replica per database, picked on its first read.
+    """
+
+    def __init__(
+        self, *, session_manager: "SessionManager", is_async: bool = False, **kwargs
+    ):
+        super().__init__(**kwargs)
+
+        self._session_manager = session_manager
+        self._is_async = is_async
+        self._replicas: dict[SessionManager, Replica | None] = {}
+
+        last_write_at = _last_write_at.get()
+        self._pinned_to_primary = (
+            last_write_at is not None
+            and time.monotonic() - last_write_at < session_manager.replica_sticky_window
+        )
+
+    def pin_to_primary(self) -> None:
+        "send every following statement of this session to the primary"
+        self._pinned_to_primary = True
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        session_manager = self._session_manager_for(mapper)
+
+        is_read = (
+            getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None
+            and not self._flushing
+        )
+
+        if not is_read:
+            self._pinned_to_primary = True
+            _last_write_at.set(time.monotonic())
+
+        if not self._pinned_to_primary and session_manager.replicas:
+            replica = self._replicas.get(session_manager)
+
+            if replica is None or not replica.healthy:
+                replica = self._replicas[session_manager] = choose_replica(
+                    session_manager.replicas
+                )
+
+            if replica is not None:
+                if self._is_async:
+                    return replica.get_async_engine().sync_engine
+
+                return replica.get_engine()
+
+        if self._is_async:
+            return session_manager.get_async_engine().sync_engine
+
+        return session_manager.get_engine()
+
+    def _session_manager_for(self, mapper) -> "SessionManager":
+        if mapper is None:
+            return self._session_manager
+
+        database = getattr(sa.inspect(mapper).class_, "__database__", None)
+
+        if database is None:
+            return self._session_manager
+
+        return self._session_manager.get_instance(name=database)
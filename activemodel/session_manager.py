@@ -6,11 +6,20 @@ database environment when testing.
 import contextlib
 import contextvars
 import json
+import threading
 import typing as t
 
 from pydantic import BaseModel
-from sqlalchemy import Connection, Engine, inspect
+from sqlalchemy import Connection, Engine, event, inspect, make_url, orm
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .n_plus_one import NPlusOneAction, NPlusOneDetector, detector_from_environment
+from .pool_stats import PoolStats
+from .query_log import attach as attach_query_log
+from .replicas import Replica, RoutingSession
 
 
 def _serialize_pydantic_model(model: BaseModel | list[BaseModel] | None) -> str | None:
@@ -45,52 +54,168 @@ class SessionManager:
     _instance: t.ClassVar[t.Optional["SessionManager"]] = None
     "singleton instance of SessionManager"
 
+    _named_instances: t.ClassVar[dict[str, "SessionManager"]] = {}
+    "additional databases registered with `init(..., name=...)`, used by models which set `__database__`"
+
+    _instance_lock: t.ClassVar[threading.Lock] = threading.Lock()
+
     session_connection: Connection | None
     "optionally specify a specific session connection to use for all get_session() calls, useful for testing and migrations"
 
+    replicas: list[Replica]
+    "read replicas, reads are routed to them by `RoutingSession` when this is not empty"
+
+    replica_sticky_window: float
+    "seconds after a write during which new sessions in the same context keep reading from the primary"
+
     @classmethod
     def get_instance(
         cls,
         database_url: str | None = None,
         *,
+        name: str | None = None,
         engine_options: dict[str, t.Any] | None = None,
+        **kwargs: t.Any,
     ) -> "SessionManager":
-        if cls._instance is None:
-            assert database_url is not None, (
-                "Database URL required for first initialization"
-            )
-            cls._instance = cls(database_url, engine_options=engine_options)
-
-        return cls._instance
+        "get the default SessionManager, or the one registered as `name`, creating it on first use"
+
+        if name is None:
+            if cls._instance is None:
+                with cls._instance_lock:
+                    if cls._instance is None:
+                        assert database_url is not None, (
+                            "Database URL required for first initialization"
+                        )
+                        cls._instance = cls(
+                            database_url, engine_options=engine_options, **kwargs
+                        )
+
+            return cls._instance
+
+        if (instance := cls._named_instances.get(name)) is None:
+            with cls._instance_lock:
+                if (instance := cls._named_instances.get(name)) is None:
+                    assert database_url is not None, (
+                        f"Database URL required for first initialization of '{name}'"
+                    )
+                    instance = cls._named_instances[name] = cls(
+                        database_url, engine_options=engine_options, **kwargs
+                    )
+
+        return instance
 
     def __init__(
-        self, database_url: str, *, engine_options: dict[str, t.Any] | None = None
+        self,
+        database_url: str,
+        *,
+        engine_options: dict[str, t.Any] | None = None,
+        replicas: list[str] | dict[str, float] | None = None,
+        replica_sticky_window: float = 5.0,
+        replica_retry_interval: float = 30.0,
     ):
         self._database_url = database_url
         self._engine = None
+        self._async_engine = None
         self._engine_options: dict = engine_options or {}
+        # concurrent first use would otherwise create (and leak) multiple engines and pools
+        self._engine_lock = threading.Lock()
+        self._pool_stats = PoolStats()
+        self._async_pool_stats = PoolStats()
 
         self.session_connection = None
 
+        if isinstance(replicas, list):
+            replicas = dict.fromkeys(replicas, 1.0)
+
+        self.replicas = [
+            Replica(
+                replica_url,
+                weight=weight,
+                engine_options=self._build_engine_options(),
+                retry_interval=replica_retry_interval,
+            )
+            for replica_url, weight in (replicas or {}).items()
+        ]
+        self.replica_sticky_window = replica_sticky_window
+
+    def _build_engine_options(
+        self,
+        pool_stats: PoolStats | None = None,
+        pool_class: type[Pool] | None = None,
+    ) -> dict[str, t.Any]:
+        engine_options = {
+            # NOTE very important! This enables pydantic models to be serialized for JSONB columns
+            "json_serializer": _serialize_pydantic_model,
+            # https://docs.sqlalchemy.org/en/20/core/pooling.html#disconnect-handling-pessimistic
+            "pool_pre_ping": True,
+            # some implementations include `future=True` but it's not required anymore
+            **self._engine_options,
+        }
+
+        # time checkouts, unless a custom pool is configured or the database does not pool with a queue (sqlite)
+        if (
+            pool_stats is not None
+            and pool_class is not None
+            and "poolclass" not in engine_options
+            and "pool" not in engine_options
+            and make_url(self._database_url).get_backend_name() == "postgresql"
+        ):
+            engine_options["poolclass"] = pool_stats.pool_class(pool_class)
+
+        return engine_options
+
+    def stats(self) -> dict[str, t.Any]:
+        """
+        Connection pool metrics as a plain dict, ready to export to a metrics system.
+
+        Includes pool size, checked out connections, overflow, a histogram of the time spent waiting for a connection,
+        connection age, pre-ping failures and invalidations. Metrics for the async engine are nested under `async`
+        once it has been created.
+        """
+
+        stats = self._pool_stats.as_dict(self.get_engine().pool)
+
+        if self._async_engine:
+            stats["async"] = self._async_pool_stats.as_dict(
+                self._async_engine.sync_engine.pool
+            )
+
+        return stats
+
     # TODO why is this type not reimported?
     def get_engine(self) -> Engine:
         if not self._engine:
-            engine_options = {
-                # NOTE very important! This enables pydantic models to be serialized for JSONB columns
-                "json_serializer": _serialize_pydantic_model,
-                # https://docs.sqlalchemy.org/en/20/core/pooling.html#disconnect-handling-pessimistic
-                "pool_pre_ping": True,
-                # some implementations include `future=True` but it's not required anymore
-                **self._engine_options,
-            }
-
-            self._engine = create_engine(
-                self._database_url,
-                **engine_options,
-            )
+            with self._engine_lock:
+                if not self._engine:
+                    self._engine = create_engine(
+                        self._database_url,
+                        **self._build_engine_options(self._pool_stats, QueuePool),
+                    )
+                    self._pool_stats.attach(self._engine)
+                    attach_query_log(self._engine)
 
         return self._engine
 
+    def get_async_engine(self) -> AsyncEngine:
+        """
+        Engine used by the `a*` model methods. It shares the database URL and engine options of the sync engine, the
+        driver must support asyncio (`postgresql+psycopg://` or `postgresql+asyncpg://`).
+        """
+
+        if not self._async_engine:
+            with self._engine_lock:
+                if not self._async_engine:
+                    self._async_engine = create_async_engine(
+                        self._database_url,
+                        **self._build_engine_options(
+                            self._async_pool_stats, AsyncAdaptedQueuePool
+                        ),
+                    )
+                    self._async_pool_stats.attach(self._async_engine.sync_engine)
+                    attach_query_log(self._async_engine.sync_engine)
+
+        return self._async_engine
+
     def get_session(self):
         "get a new database session, respecting any globally set sessions"
 
@@ -106,26 +231,106 @@ class SessionManager:
         if self.session_connection:
             return Session(bind=self.session_connection)
 
+        if self._needs_routing():
+            return RoutingSession(session_manager=self)
+
         return Session(self.get_engine())
 
+    def get_async_session(self) -> t.AsyncContextManager[AsyncSession]:
+        "get a new async database session, respecting a session set by `async_global_session()`"
+
+        if asession := _async_session_context.get():
+
+            @contextlib.asynccontextmanager
+            async def _reuse_session():
+                yield asession
+
+            return _reuse_session()
+
+        if self._needs_routing():
+            return AsyncSession(
+                sync_session_class=RoutingSession, session_manager=self, is_async=True
+            )
+
+        return AsyncSession(self.get_async_engine())
+
+    def _needs_routing(self) -> bool:
+        "plain sessions bound to a single engine skip the per-statement routing in `RoutingSession.get_bind`"
+        return bool(self.replicas or self._named_instances)
+
+    def check_replicas(self) -> dict[str, bool]:
+        """
+        Health check every replica with `SELECT 1`. Failing replicas receive no reads until they pass a check or
+        their retry interval expires. Replicas are also marked unhealthy when a connection to them fails during a
+        query, so calling this periodically is optional.
+        """
+
+        return {replica.database_url: replica.check() for replica in self.replicas}
+
+
+@contextlib.contextmanager
+def _preserve_loaded_state(session: Session):
+    """
+    Commit without expiring the instances held by the session.
+
+    By default a commit expires every loaded attribute, so the next access issues a SELECT per instance. Bulk write
+    paths already have the server-generated values (via RETURNING), so reloading them is wasted work.
+    """
+
+    previous_expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+
+    try:
+        yield session
+    finally:
+        session.expire_on_commit = previous_expire_on_commit
+
 
 # TODO would be great one day to type engine_options as the SQLAlchemy EngineOptions
-def init(database_url: str, *, engine_options: dict[str, t.Any] | None = None):
-    "configure activemodel to connect to a specific database"
-    return SessionManager.get_instance(database_url, engine_options=engine_options)
+def init(
+    database_url: str,
+    *,
+    name: str | None = None,
+    engine_options: dict[str, t.Any] | None = None,
+    replicas: list[str] | dict[str, float] | None = None,
+    replica_sticky_window: float = 5.0,
+    replica_retry_interval: float = 30.0,
+):
+    """
+    Configure activemodel to connect to a specific database.
+
+    Args:
+        name: register an additional database, used by models which set `__database__ = name`
+        replicas: read replica URLs, or a mapping of URL to weight for weighted selection
+        replica_sticky_window: seconds after a write during which reads in the same context stay on the primary
+        replica_retry_interval: seconds an unreachable replica is skipped before it is tried again
+    """
+    return SessionManager.get_instance(
+        database_url,
+        name=name,
+        engine_options=engine_options,
+        replicas=replicas,
+        replica_sticky_window=replica_sticky_window,
+        replica_retry_interval=replica_retry_interval,
+    )
 
 
 def table_exists(model: type[SQLModel]) -> bool:
     """
     Check if the table for the given model exists in the database.
     """
-    engine = get_engine()
+    engine = get_engine(getattr(model, "__database__", None))
     return inspect(engine).has_table(model.__tablename__)
 
 
-def get_engine():
+def get_engine(name: str | None = None):
     "alias to get the database engine without importing SessionManager"
-    return SessionManager.get_instance().get_engine()
+    return SessionManager.get_instance(name=name).get_engine()
+
+
+def get_async_engine(name: str | None = None):
+    "alias to get the async database engine without importing SessionManager"
+    return SessionManager.get_instance(name=name).get_async_engine()
 
 
 def get_session():
@@ -133,6 +338,11 @@ def get_session():
     return SessionManager.get_instance().get_session()
 
 
+def get_async_session():
+    "alias to get an async database session without importing SessionManager"
+    return SessionManager.get_instance().get_async_session()
+
+
 _session_context = contextvars.ContextVar[Session | None](
     "session_context", default=None
 )
@@ -147,7 +357,11 @@ a place to persist a session to use globally across the application.
 
 
 @contextlib.contextmanager
-def global_session(session: Session | None = None):
+def global_session(
+    session: Session | None = None,
+    *,
+    n_plus_one: NPlusOneAction | NPlusOneDetector | None = None,
+):
     """
     Generate a session and share it across all activemodel calls.
 
@@ -167,6 +381,8 @@ def global_session(session: Session | None = None):
 
     Args:
         session: Use an existing session instead of creating a new one
+        n_plus_one: Detect N+1 lazy loads made with this session: `warn`, `log` or `raise`. Defaults to the
+            `ACTIVEMODEL_N_PLUS_ONE` environment variable, detection is disabled when neither is set.
     """
 
     current_session = _session_context.get()
@@ -181,25 +397,255 @@ def global_session(session: Session | None = None):
         )
 
     @contextlib.contextmanager
-    def manage_existing_session():
+    def manage_existing_session(existing_session: Session):
         "if an existing session already exists, use it without triggering another __enter__"
-        yield session
+        yield existing_session
 
     # Use provided session or create a new one
     session_context = (
-        manage_existing_session()
+        manage_existing_session(session)
         if session is not None
         else SessionManager.get_instance().get_session()
     )
 
+    if isinstance(n_plus_one, str):
+        detector = NPlusOneDetector(n_plus_one)
+    else:
+        detector = n_plus_one or detector_from_environment()
+
     with session_context as s:
         token = _session_context.set(s)
 
+        if detector:
+            detector.attach(s)
+
+        try:
+            yield s
+        finally:
+            if detector:
+                detector.detach(s)
+
+            _session_context.reset(token)
+
+
+_async_session_context = contextvars.ContextVar[AsyncSession | None](
+    "async_session_context", default=None
+)
+"The `AsyncSession` counterpart of `_session_context`, set by `async_global_session()`"
+
+
+@contextlib.asynccontextmanager
+async def async_global_session(session: AsyncSession | None = None):
+    """
+    Share an `AsyncSession` across all async activemodel calls (`aget()`, `asave()`, etc) in this context.
+
+    Follows the same rules as `global_session()`: nesting is a noop unless a different session is passed in.
+
+    Args:
+        session: Use an existing session instead of creating a new one
+    """
+
+    current_session = _async_session_context.get()
+    if current_session is not None:
+        if session is None or session is current_session:
+            yield current_session
+            return
+
+        raise RuntimeError(
+            "ActiveModel: async global session already set with a different session"
+        )
+
+    if session is None:
+        session_context = SessionManager.get_instance().get_async_session()
+    else:
+        session_context = contextlib.nullcontext(session)
+
+    async with session_context as s:
+        token = _async_session_context.set(s)
+
         try:
             yield s
+        finally:
+            _async_session_context.reset(token)
+
+
+async def _run_in_async_session[T](fn: t.Callable[[], T]) -> T:
+    """
+    Run synchronous activemodel code against an `AsyncSession` without blocking the event loop.
+
+    `AsyncSession.run_sync` executes `fn` in a greenlet where the sync session's database calls are awaited on the
+    event loop. Setting the sync session as the global session makes `get_session()` return it, so the async model
+    methods reuse the exact same code paths (hooks, JSON rehydration, snapshots, lazy loads in hooks) as the sync
+    ones.
+    """
+
+    def run(sync_session: orm.Session) -> T:
+        # `sqlmodel.AsyncSession` wraps a `sqlmodel.Session`
+        token = _session_context.set(t.cast(Session, sync_session))
+
+        try:
+            return fn()
         finally:
             _session_context.reset(token)
 
+    async with get_async_session() as session:
+        return await session.run_sync(run)
+
+
+_transaction_callbacks = contextvars.ContextVar[list[t.Callable[[], None]] | None](
+    "transaction_callbacks", default=None
+)
+"""
+Callbacks to run once the outermost `transaction()` commits. `None` when no transaction block is active.
+
+Like `_session_context`, this must be defined at the top-level of the module.
+"""
+
+_transaction_session = contextvars.ContextVar[Session | None](
+    "transaction_session", default=None
+)
+"The session the outermost `transaction()` block commits, writes on any other session would not be part of it"
+
+
+@contextlib.contextmanager
+def transaction():
+    """
+    Group writes into a single database transaction.
+
+    Inside this block `save()`, `delete()` and the bulk write methods only flush their changes. The whole block is
+    committed once when it exits, or rolled back if it raises. This avoids a commit (and fsync) per write and holds row
+    locks until the block completes.
+
+    The block runs inside `global_session()`, so an existing global session is reused. Nested blocks use a SAVEPOINT:
+    an exception raised inside a nested block only rolls back the writes made within it.
+
+    `after_commit` hooks of the saved and deleted models are deferred until the outermost block commits and are
+    dropped if their writes are rolled back.
+
+    Async writes (`asave()`, `adelete()`, ...) run on a separate `AsyncSession` which the block can not commit, so they
+    raise inside it.
+
+    >>> with activemodel.transaction():
+    >>>     user.save()
+    >>>     with activemodel.transaction():
+    >>>         audit_log.save()
+    """
+
+    if (parent_callbacks := _transaction_callbacks.get()) is not None:
+        yield from _savepoint(parent_callbacks)
+        return
+
+    with global_session() as session:
+        # a read-modify-write must read the rows from the primary, a replica may lag behind it
+        if isinstance(session, RoutingSession):
+            session.pin_to_primary()
+
+        callbacks: list[t.Callable[[], None]] = []
+        token = _transaction_callbacks.set(callbacks)
+        session_token = _transaction_session.set(session)
+
+        try:
+            yield session
+
+            # everything was flushed by this session, so there is nothing to reload after the commit
+            with _preserve_loaded_state(session):
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            _transaction_callbacks.reset(token)
+            _transaction_session.reset(session_token)
+
+        # run after the transaction context is cleared so writes made by callbacks commit on their own
+        for callback in callbacks:
+            callback()
+
+
+def _savepoint(parent_callbacks: list[t.Callable[[], None]]):
+    session = _session_context.get()
+    assert session is not None, "transaction() requires a global session"
+
+    callbacks: list[t.Callable[[], None]] = []
+    token = _transaction_callbacks.set(callbacks)
+
+    try:
+        # releases the SAVEPOINT on success and rolls back to it if the block raises
+        with session.begin_nested():
+            yield session
+    finally:
+        _transaction_callbacks.reset(token)
+
+    # only reached when the savepoint was released, rolled back work never runs its callbacks
+    parent_callbacks.extend(callbacks)
+
+
+def _commit_or_flush(session: Session, *, preserve_loaded_state: bool = False) -> bool:
+    """
+    Commit the session, or only flush it when a `transaction()` block is active so the block can commit once.
+
+    Returns True if a commit happened.
+    """
+
+    if _transaction_callbacks.get() is not None:
+        # only flushing any other session would silently drop the writes when that session closes
+        if session is not _transaction_session.get():
+            raise RuntimeError(
+                "ActiveModel: writes inside transaction() must use its session, async writes (asave(), adelete(), "
+                "etc) run on a separate AsyncSession which the transaction can not commit"
+            )
+
+        session.flush()
+        return False
+
+    with (
+        _preserve_loaded_state(session)
+        if preserve_loaded_state
+        else contextlib.nullcontext()
+    ):
+        session.commit()
+
+    return True
+
+
+_FLUSHED_KEY = "activemodel_flushed"
+"`session.info` flag set once the session flushes, until its transaction ends"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    session.info[_FLUSHED_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_flushed(session: Session, transaction) -> None:
+    # savepoints end inside the outer transaction, which still holds their flushed writes
+    if transaction.parent is None:
+        session.info.pop(_FLUSHED_KEY, None)
+
+
+def _has_uncommitted_flush(session: orm.Session | None) -> bool:
+    """
+    True if the session flushed writes (e.g. by autoflush before a query) which no one has committed yet.
+
+    A `transaction()` block commits its flushed writes when it exits, so they are not counted inside one.
+    """
+
+    if session is None or _transaction_callbacks.get() is not None:
+        return False
+
+    return session.info.get(_FLUSHED_KEY, False)
+
+
+def _run_after_commit(callback: t.Callable[[], None]) -> None:
+    "run the callback now, or once the active `transaction()` block commits"
+
+    if (callbacks := _transaction_callbacks.get()) is not None:
+        callbacks.append(callback)
+        return
+
+    callback()
+
 
 async def aglobal_session():
     """
@@ -223,3 +669,19 @@ async def aglobal_session():
             yield
         finally:
             _session_context.reset(token)
+
+
+async def aglobal_async_session():
+    """
+    FastAPI dependency which shares an `AsyncSession` across the request, for routes using `aget()`, `asave()` etc.
+
+    `aglobal_session()` shares a sync `Session`, which blocks the event loop on every query.
+
+    >>> APIRouter(dependencies=[Depends(aglobal_async_session)])
+    """
+
+    if _async_session_context.get() is not None:
+        raise RuntimeError("async global session already set")
+
+    async with async_global_session():
+        yield
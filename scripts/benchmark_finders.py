@@ -0,0 +1,56 @@
+"""Benchmark the per-call statement overhead of `get`/`one`/`one_or_none` with and without cached statements.
+
+Only statement construction and cache key generation are measured, since that is the part the cached finder
+statements remove. No database connection is needed.
+
+    uv run python scripts/benchmark_finders.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+# Ensure we can import from activemodel
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Field, select
+from typeid import TypeID
+
+from activemodel import BaseModel
+from activemodel.mixins import TypeIDPrimaryKey
+
+ITERATIONS = 20_000
+
+
+class BenchmarkUser(BaseModel, table=True):
+    id: TypeID = TypeIDPrimaryKey("bench")
+    email: str = Field(unique=True)
+    name: str
+
+
+def fresh_statement():
+    statement = select(BenchmarkUser).filter_by(email="user@example.com")
+    statement._generate_cache_key()
+
+
+def cached_statement():
+    statement, _params = BenchmarkUser._filter_statement(
+        (), {"email": "user@example.com"}
+    )
+    statement._generate_cache_key()
+
+
+def main():
+    results = {}
+
+    for label, fn in [("filter_by", fresh_statement), ("cached", cached_statement)]:
+        # best of several runs to smooth out noise
+        seconds = min(timeit.repeat(fn, number=ITERATIONS, repeat=5))
+        results[label] = seconds / ITERATIONS * 1_000_000
+        print(f"{label:>10}: {results[label]:7.2f}µs per call")
+
+    print(f"{'speedup':>10}: {results['filter_by'] / results['cached']:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
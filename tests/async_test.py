@@ -0,0 +1,149 @@
+import pytest
+
+import activemodel
+from activemodel.session_manager import async_global_session, get_async_engine
+from tests.lifecycle._helpers import (
+    AfterCommitModel,
+    AfterInitializeModel,
+    LifecycleModel,
+    events,
+)
+from tests.models import ExampleRecord
+from tests.pydantic_json.helpers import ExampleWithSimpleJSON, SubObject
+from tests.utils import capture_sql
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def dispose_async_engine():
+    yield
+
+    # pooled connections are bound to the event loop of the test which opened them
+    await get_async_engine().dispose()
+
+
+async def test_asave_and_finders(create_and_wipe_database):
+    record = await ExampleRecord(something="async").asave()
+
+    assert not record.is_new()
+    by_id = await ExampleRecord.aget(record.id)
+    assert by_id is not None and by_id.something == "async"
+
+    by_filter = await ExampleRecord.aget(something="async")
+    assert by_filter is not None and by_filter.id == record.id
+
+    assert (await ExampleRecord.afind(str(record.id))).id == record.id
+    assert (await ExampleRecord.aone(something="async")).id == record.id
+    assert await ExampleRecord.aone_or_none(something="missing") is None
+    assert await ExampleRecord.acount() == 1
+
+
+async def test_async_methods_do_not_use_sync_engine(create_and_wipe_database):
+    with capture_sql() as statements:
+        record = await ExampleRecord(something="async").asave()
+        await ExampleRecord.afind(record.id)
+
+    assert statements == []
+
+
+async def test_asave_update_arefresh_and_adelete(create_and_wipe_database):
+    record = await ExampleRecord(something="before").asave()
+
+    record.something = "after"
+    await record.asave()
+    assert (await ExampleRecord.afind(record.id)).something == "after"
+
+    await record.arefresh()
+    assert record.something == "after"
+
+    assert await record.adelete() is True
+    assert await ExampleRecord.aget(record.id) is None
+
+
+async def test_asave_runs_hooks(create_and_wipe_database):
+    events.clear()
+
+    await LifecycleModel(name="async").asave()
+
+    assert events == [
+        "before_create",
+        "before_save",
+        "around_save_before",
+        "around_save_after",
+        "after_create",
+        "after_save",
+    ]
+
+
+async def test_json_rehydration_and_mutation_tracking(create_and_wipe_database):
+    record = await ExampleWithSimpleJSON(
+        object_field=SubObject(name="first", value=1)
+    ).asave()
+
+    loaded = await ExampleWithSimpleJSON.afind(record.id)
+    assert isinstance(loaded.object_field, SubObject)
+
+    loaded.object_field.value = 2
+    await loaded.asave()
+
+    reloaded = await ExampleWithSimpleJSON.afind(record.id)
+    assert reloaded.object_field.value == 2
+
+
+async def test_query_wrapper_async_methods(create_and_wipe_database):
+    for name in ["a", "b", "c"]:
+        await ExampleRecord(something=name).asave()
+
+    query = ExampleRecord.select().where(ExampleRecord.something != "c")
+
+    assert await query.acount() == 2
+    assert await query.aexists()
+    assert {record.something for record in await query.aall()} == {"a", "b"}
+    first = await query.afirst()
+    assert first is not None and first.something in {"a", "b"}
+
+    streamed = [record.something async for record in query]
+    assert len(streamed) == 2 and set(streamed) == {"a", "b"}
+
+
+async def test_astream_runs_load_hooks(create_and_wipe_database):
+    await AfterInitializeModel(name="streamed").asave()
+    events.clear()
+
+    records = [record async for record in AfterInitializeModel.select().astream(1)]
+
+    assert records[0].initialized_name == "initialized:streamed"
+    assert events == ["after_find:streamed", "after_initialize:streamed"]
+
+
+async def test_async_global_session_shares_session(create_and_wipe_database):
+    record = await ExampleRecord(something="shared").asave()
+
+    async with async_global_session():
+        first = await ExampleRecord.afind(record.id)
+        second = await ExampleRecord.afind(record.id)
+
+        assert first is second
+
+
+async def test_query_log_records_async_statements(create_and_wipe_database):
+    with activemodel.query_log() as log:
+        await ExampleRecord.aget(something="missing")
+
+    assert [entry.caller for entry in log.entries] == ["BaseModel.get"]
+
+
+async def test_async_writes_raise_inside_transaction(create_and_wipe_database):
+    events.clear()
+
+    with pytest.raises(RuntimeError, match="transaction"), activemodel.transaction():
+        await AfterCommitModel(name="lost").asave()
+
+    assert "after_commit:lost" not in events
+    assert await AfterCommitModel.acount() == 0
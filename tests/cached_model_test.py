@@ -0,0 +1,157 @@
+import time
+
+import pytest
+
+import activemodel
+from activemodel.mixins.cached import ModelCache
+from activemodel.session_manager import global_session
+from tests.models import CachedPlan, ExampleRecord
+from tests.utils import capture_sql
+
+
+def setup_function():
+    CachedPlan.clear_cache()
+
+
+def test_get_reads_through_cache(create_and_wipe_database):
+    plan = CachedPlan(name="basic").save()
+
+    first = CachedPlan.get(plan.id)
+
+    with capture_sql() as statements:
+        second = CachedPlan.get(str(plan.id))
+        third = CachedPlan.find(plan.id)
+
+    assert statements == []
+    assert first is not None and second is not None
+    assert second.name == third.name == "basic"
+    assert second is not first
+    assert second is not third
+    assert not second.is_new()
+
+    assert CachedPlan.cache_stats()["hits"] == 2
+
+
+def test_filtered_get_skips_cache(create_and_wipe_database):
+    plan = CachedPlan(name="filtered").save()
+    CachedPlan.get(plan.id)
+
+    with capture_sql() as statements:
+        assert CachedPlan.get(name="filtered") is not None
+
+    assert len(statements) == 1
+
+
+def test_cached_copy_can_be_saved(create_and_wipe_database):
+    plan = CachedPlan(name="before").save()
+    CachedPlan.get(plan.id)
+
+    copy = CachedPlan.find(plan.id)
+    copy.name = "after"
+    copy.save()
+
+    assert CachedPlan.find(plan.id).name == "after"
+    assert CachedPlan.count() == 1
+
+
+def test_writes_invalidate_cache(create_and_wipe_database):
+    plan = CachedPlan(name="v1").save()
+    CachedPlan.find(plan.id)
+
+    plan.name = "v2"
+    plan.save()
+    assert CachedPlan.find(plan.id).name == "v2"
+
+    CachedPlan.upsert({"id": plan.id, "name": "v3"}, unique_by="id")
+    assert CachedPlan.find(plan.id).name == "v3"
+
+    CachedPlan.upsert_all([{"id": plan.id, "name": "v4"}], unique_by="id")
+    assert CachedPlan.find(plan.id).name == "v4"
+
+    plan.soft_delete()
+    assert CachedPlan.find(plan.id).deleted_at is not None
+
+    plan.delete()
+    assert CachedPlan.get(plan.id) is None
+
+
+def test_rolled_back_reads_are_not_cached(create_and_wipe_database):
+    plan = CachedPlan(name="committed").save()
+
+    with pytest.raises(RuntimeError), activemodel.transaction():
+        CachedPlan.update_by_id(plan.id, name="rolled back")
+
+        uncommitted = CachedPlan.get(plan.id)
+        assert uncommitted is not None and uncommitted.name == "rolled back"
+
+        raise RuntimeError("rollback")
+
+    committed = CachedPlan.get(plan.id)
+    assert committed is not None and committed.name == "committed"
+    assert CachedPlan.find(plan.id).name == "committed"
+
+
+def test_mutating_a_cached_copy_does_not_leak(create_and_wipe_database):
+    plan = CachedPlan(name="shared").save()
+    CachedPlan.find(plan.id)
+
+    CachedPlan.find(plan.id).name = "mutated"
+
+    assert CachedPlan.find(plan.id).name == "shared"
+
+
+def test_identity_map_wins_over_cache(create_and_wipe_database):
+    plan = CachedPlan(name="cached").save()
+    CachedPlan.find(plan.id)
+
+    with global_session():
+        loaded = CachedPlan.get(name="cached")
+        assert loaded is not None
+        loaded.name = "unflushed"
+
+        assert CachedPlan.find(plan.id) is loaded
+
+
+def test_expired_instances_are_reused(create_and_wipe_database):
+    plan = CachedPlan(name="cached").save()
+    CachedPlan.find(plan.id)
+
+    with global_session():
+        loaded = CachedPlan.get(plan.id)
+        assert loaded is not None
+
+        # the commit expires every instance in the global session
+        ExampleRecord(something="other").save()
+
+        assert CachedPlan.get(plan.id) is loaded
+        assert CachedPlan.find(plan.id) is loaded
+        assert loaded.name == "cached"
+
+        loaded.name = "renamed"
+        loaded.save()
+
+    assert CachedPlan.find(plan.id).name == "renamed"
+
+
+def test_lru_eviction(create_and_wipe_database):
+    plans = CachedPlan.insert_all([{"name": str(i)} for i in range(3)])
+
+    for plan in plans:
+        CachedPlan.find(plan.id)
+
+    stats = CachedPlan.cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["misses"] == 3
+
+
+def test_ttl_expiry():
+    cache = ModelCache(max_size=10, ttl=0.01)
+    cache.set("key", {"name": "value"})
+
+    assert cache.get("key") == {"name": "value"}
+
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 0}
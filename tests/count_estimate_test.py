@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import text
+
+import activemodel
+from activemodel.query_log import QueryLog
+from activemodel.session_manager import global_session
+from tests.models import ExampleRecord
+
+
+def analyze() -> None:
+    with global_session() as session:
+        session.execute(text(f"ANALYZE {ExampleRecord.__tablename__}"))
+        session.commit()
+
+
+@pytest.fixture
+def analyzed_records(create_and_wipe_database, monkeypatch):
+    monkeypatch.setattr(ExampleRecord, "__count_estimate_threshold__", 10)
+
+    ExampleRecord.insert_all([{"something": "a" if i % 4 else "b"} for i in range(200)])
+    analyze()
+
+
+def executed_statements(log: QueryLog) -> str:
+    return "\n".join(entry.sql for entry in log.entries)
+
+
+def test_unfiltered_estimate_reads_table_statistics(analyzed_records):
+    with activemodel.query_log() as log:
+        assert ExampleRecord.count(estimate=True) == 200
+        assert (
+            ExampleRecord.select().order_by(ExampleRecord.id).count(estimate=True)
+            == 200
+        )
+
+    statements = executed_statements(log)
+    assert "pg_class" in statements
+    assert "count(" not in statements
+
+
+def test_filtered_estimate_uses_explain(analyzed_records):
+    with activemodel.query_log() as log:
+        estimate = ExampleRecord.where(ExampleRecord.something == "b").count(
+            estimate=True
+        )
+
+    assert 25 <= estimate <= 75
+
+    statements = executed_statements(log)
+    assert "EXPLAIN" in statements
+    assert "count(" not in statements
+
+
+def test_small_estimates_are_counted_exactly(analyzed_records, monkeypatch):
+    monkeypatch.setattr(ExampleRecord, "__count_estimate_threshold__", 1_000)
+
+    with activemodel.query_log() as log:
+        assert ExampleRecord.count(estimate=True) == 200
+        assert (
+            ExampleRecord.where(ExampleRecord.something == "b").count(estimate=True)
+            == 50
+        )
+
+    assert executed_statements(log).count("count(") == 2
+
+
+def test_tables_without_statistics_are_counted_exactly(create_and_wipe_database):
+    ExampleRecord(something="new").save()
+
+    assert ExampleRecord.count(estimate=True) == 1
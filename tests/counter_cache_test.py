@@ -0,0 +1,117 @@
+from sqlmodel import Field
+from typeid import TypeID
+
+from activemodel import BaseModel
+from activemodel.mixins import TypeIDPrimaryKey
+from activemodel.session_manager import global_session
+
+
+class CounterPost(BaseModel, table=True):
+    id: TypeID = TypeIDPrimaryKey("counter_post")
+    comments_count: int = Field(default=0)
+
+
+class CounterComment(BaseModel, table=True):
+    id: TypeID = TypeIDPrimaryKey("counter_comment")
+    post_id: TypeID | None = CounterPost.foreign_key(
+        counter_cache="comments_count", nullable=True
+    )
+
+
+def comments_count(post: CounterPost) -> int:
+    return CounterPost.one(post.id).comments_count
+
+
+def test_create_and_delete_update_the_counter(create_and_wipe_database):
+    post = CounterPost().save()
+
+    comment = CounterComment(post_id=post.id).save()
+    CounterComment(post_id=post.id).save()
+    assert comments_count(post) == 2
+
+    comment.delete()
+    assert comments_count(post) == 1
+
+
+def test_reparenting_moves_the_count(create_and_wipe_database):
+    first, second = CounterPost().save(), CounterPost().save()
+    comment = CounterComment(post_id=first.id).save()
+
+    comment.post_id = second.id
+    comment.save()
+    assert (comments_count(first), comments_count(second)) == (0, 1)
+
+    # unrelated updates leave the counter alone
+    comment.save()
+    assert comments_count(second) == 1
+
+    comment.post_id = None
+    comment.save()
+    assert comments_count(second) == 0
+
+
+def test_bulk_inserts_and_find_or_create(create_and_wipe_database):
+    post = CounterPost().save()
+
+    CounterComment.insert_all([{"post_id": post.id} for _ in range(3)])
+    assert comments_count(post) == 3
+
+    comment_id = TypeID("counter_comment")
+    CounterComment.find_or_create_by(id=comment_id, post_id=post.id)
+    CounterComment.find_or_create_by(id=comment_id, post_id=post.id)
+    assert comments_count(post) == 4
+
+
+def test_autoflushed_reparenting_moves_the_count(create_and_wipe_database):
+    first, second = CounterPost().save(), CounterPost().save()
+    comment = CounterComment(post_id=first.id).save()
+
+    with global_session():
+        loaded = CounterComment.one(comment.id)
+        loaded.post_id = second.id
+
+        # the query autoflushes the change before save() runs
+        assert CounterComment.where(CounterComment.post_id == second.id).count() == 1
+
+        loaded.save()
+
+    assert (comments_count(first), comments_count(second)) == (0, 1)
+
+
+def test_find_or_create_all(create_and_wipe_database):
+    post = CounterPost().save()
+    comment_ids = [TypeID("counter_comment"), TypeID("counter_comment")]
+
+    CounterComment.find_or_create_all(
+        [{"id": comment_id, "post_id": post.id} for comment_id in comment_ids],
+        unique_by="id",
+    )
+    CounterComment.find_or_create_all(
+        [{"id": comment_ids[0], "post_id": post.id}], unique_by="id"
+    )
+
+    assert comments_count(post) == 2
+
+
+def test_loaded_parent_is_updated(create_and_wipe_database):
+    with global_session():
+        post = CounterPost().save()
+        CounterComment(post_id=post.id).save()
+
+        assert post.comments_count == 1
+
+
+def test_reset_counters(create_and_wipe_database):
+    first, second = CounterPost().save(), CounterPost().save()
+    CounterComment.insert_all(
+        [{"post_id": first.id}, {"post_id": first.id}, {"post_id": second.id}]
+    )
+
+    CounterPost.where(CounterPost.id == first.id).update_all(comments_count=10)
+    CounterPost.where(CounterPost.id == second.id).update_all(comments_count=10)
+
+    CounterPost.reset_counters(first.id)
+    assert (comments_count(first), comments_count(second)) == (2, 10)
+
+    CounterPost.reset_counters()
+    assert (comments_count(first), comments_count(second)) == (2, 1)
@@ -0,0 +1,104 @@
+from typeid import TypeID
+from whenever import ZonedDateTime
+
+from activemodel import BaseModel
+from activemodel.mixins import TypeIDPrimaryKey
+from activemodel.mixins.timestamps import TimestampsMixin
+from activemodel.session_manager import global_session
+from tests.models import ExampleRecord
+from tests.pydantic_json.helpers import ExampleWithSimpleJSON, SubObject
+from tests.utils import capture_sql
+
+
+class LeanByDefaultRecord(BaseModel, TimestampsMixin, table=True):
+    __lean_save__ = True
+
+    id: TypeID = TypeIDPrimaryKey("lean_default")
+    name: str | None = None
+
+
+def _selects(statements: list[str]) -> list[str]:
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_lean_save_create_populates_server_defaults_without_select(
+    create_and_wipe_database,
+):
+    with capture_sql() as statements:
+        record = ExampleRecord(something="lean").save(lean=True)
+
+        assert isinstance(record.created_at, ZonedDateTime)
+        assert isinstance(record.updated_at, ZonedDateTime)
+
+    assert _selects(statements) == []
+
+
+def test_lean_save_update_returns_updated_at(create_and_wipe_database):
+    record = ExampleRecord(something="before").save(lean=True)
+    original_updated_at = record.updated_at
+
+    record.something = "after"
+
+    with capture_sql() as statements:
+        record.save(lean=True)
+
+        assert record.updated_at != original_updated_at
+
+    assert _selects(statements) == []
+    assert ExampleRecord.one(record.id).something == "after"
+
+
+def test_lean_save_skips_clean_instances(create_and_wipe_database):
+    record = ExampleRecord(something="clean").save(lean=True)
+
+    with capture_sql() as statements:
+        assert record.save(lean=True) is record
+
+    assert statements == []
+
+
+def test_lean_save_commits_autoflushed_changes(create_and_wipe_database):
+    record = ExampleRecord(something="before").save()
+
+    with global_session():
+        loaded = ExampleRecord.find(record.id)
+        loaded.something = "after"
+
+        # the query autoflushes the UPDATE, which leaves the instance clean
+        list(ExampleRecord.select().all())
+        assert not loaded.modified_fields()
+
+        loaded.save(lean=True)
+
+    assert ExampleRecord.find(record.id).something == "after"
+
+
+def test_lean_save_detects_json_mutations(create_and_wipe_database):
+    record = ExampleWithSimpleJSON(object_field=SubObject(name="a", value=1)).save(
+        lean=True
+    )
+
+    with capture_sql() as statements:
+        record.save(lean=True)
+
+    assert statements == []
+
+    record.object_field.value = 2
+    record.save(lean=True)
+
+    assert isinstance(record.object_field, SubObject)
+
+    persisted = ExampleWithSimpleJSON.one(record.id)
+    assert persisted.object_field.value == 2
+
+
+def test_model_level_lean_default(create_and_wipe_database):
+    with capture_sql() as statements:
+        record = LeanByDefaultRecord(name="model default").save()
+
+    assert _selects(statements) == []
+
+    with capture_sql() as statements:
+        record.save()
+
+    assert statements == []
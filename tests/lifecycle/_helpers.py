@@ -2,7 +2,7 @@ from contextlib import contextmanager
 
 from sqlmodel import Field, Relationship
 
-from activemodel import BaseModel
+from activemodel import BaseModel, hook
 from activemodel.logger import logger
 from typeid import TypeID
 from tests.models import AnotherExample
@@ -148,3 +148,43 @@ class AfterInitializeModelWithRelationships(BaseModel, table=True):
             return
 
         events.append(f"after_initialize_relationship:{self.another_example.note}")
+
+
+class AfterCommitModel(BaseModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str | None = None
+
+    def after_save(self):
+        events.append(f"after_save:{self.name}")
+
+    def after_delete(self):
+        events.append(f"after_delete:{self.name}")
+
+    def after_commit(self):
+        events.append(f"after_commit:{self.name}")
+
+
+class HookRegistryParent(BaseModel):
+    name: str | None = None
+
+    def before_save(self):
+        events.append("before_save")
+
+    @hook("before_save")
+    def parent_callback(self):
+        events.append("parent_callback")
+
+    @hook("before_save")
+    def overridden_callback(self):
+        events.append("parent_overridden_callback")
+
+
+class HookRegistryModel(HookRegistryParent, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+
+    @hook("before_save", "after_save")
+    def child_callback(self):
+        events.append("child_callback")
+
+    def overridden_callback(self):
+        events.append("child_overridden_callback")
@@ -0,0 +1,16 @@
+from tests.lifecycle._helpers import AfterCommitModel, events
+
+
+def test_after_commit_runs_after_save():
+    AfterCommitModel(name="saved").save()
+
+    assert events == ["after_save:saved", "after_commit:saved"]
+
+
+def test_after_commit_runs_after_delete():
+    obj = AfterCommitModel(name="deleted").save()
+
+    events.clear()
+    obj.delete()
+
+    assert events == ["after_delete:deleted", "after_commit:deleted"]
@@ -0,0 +1,51 @@
+import pytest
+
+from activemodel import BaseModel, hook
+from tests.lifecycle._helpers import HookRegistryModel, events
+from tests.models import ExampleRecord
+
+
+def test_hook_callbacks_run_in_order():
+    HookRegistryModel(name="first").save()
+
+    assert events == [
+        "before_save",
+        "parent_callback",
+        "child_callback",
+        "child_callback",
+    ]
+
+
+def test_overridden_callbacks_are_not_registered():
+    callbacks = HookRegistryModel.__lifecycle_hooks__["before_save"]
+
+    assert HookRegistryModel.overridden_callback not in callbacks
+    assert [callback.__name__ for callback in callbacks] == [
+        "before_save",
+        "parent_callback",
+        "child_callback",
+    ]
+
+
+def test_models_without_hooks_have_empty_registry():
+    assert ExampleRecord.__lifecycle_hooks__ == {}
+
+
+def test_invalid_hook_signature_raises_at_class_creation():
+    with pytest.raises(TypeError, match="must accept exactly 1 positional argument"):
+
+        class InvalidHookModel(BaseModel):
+            def after_save(self, extra):
+                pass
+
+    with pytest.raises(TypeError, match="must accept exactly 1 positional argument"):
+
+        class InvalidDecoratedHookModel(BaseModel):
+            @hook("after_save")
+            def callback(self, extra):
+                pass
+
+
+def test_unknown_hook_name_raises():
+    with pytest.raises(ValueError, match="Unknown lifecycle hooks: after_everything"):
+        hook("after_everything")
@@ -7,7 +7,7 @@ from sqlmodel import Field, Relationship
 from whenever import Date, Instant, PlainDateTime, Time, ZonedDateTime
 
 from activemodel import BaseModel, property_field
-from activemodel.mixins import TypeIDPrimaryKey
+from activemodel.mixins import CachedModelMixin, SoftDeletionMixin, TypeIDPrimaryKey
 from activemodel.mixins.timestamps import TimestampsMixin
 from typeid import TypeID
 
@@ -85,3 +85,11 @@ class ExampleRelatedModel(BaseModel, table=True):
     id: TypeID = TypeIDPrimaryKey("related_model")
     example_record_id: TypeID = ExampleRecord.foreign_key(index=True)
     example_record: ExampleRecord = Relationship()
+
+
+class CachedPlan(BaseModel, CachedModelMixin, SoftDeletionMixin, table=True):
+    __cache_max_size__ = 2
+
+    id: TypeID = TypeIDPrimaryKey("cached_plan")
+    name: str
+    unique_key: str | None = None
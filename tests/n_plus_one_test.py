@@ -0,0 +1,107 @@
+import logging
+
+import pytest
+from sqlalchemy.orm import selectinload
+
+from activemodel.errors import NPlusOneError, NPlusOneWarning
+from activemodel.logger import logger
+from activemodel.n_plus_one import NPlusOneDetector
+from activemodel.session_manager import global_session
+from tests.models import ExampleRecord, ExampleRelatedModel
+
+
+def create_related_records(count: int = 3) -> None:
+    with global_session():
+        for _ in range(count):
+            record = ExampleRecord().save()
+            ExampleRelatedModel(example_record_id=record.id).save()
+
+
+def test_raises_on_repeated_lazy_loads(create_and_wipe_database):
+    create_related_records()
+
+    with global_session(n_plus_one="raise"):
+        related = list(ExampleRelatedModel.select().all())
+
+        assert related[0].example_record is not None
+
+        with pytest.raises(NPlusOneError, match=r"ExampleRelatedModel\.example_record"):
+            _ = related[1].example_record
+
+
+def test_warns_once_with_callsite(create_and_wipe_database):
+    create_related_records()
+
+    with global_session(n_plus_one="warn"), pytest.warns(NPlusOneWarning) as record:
+        _ = [related.example_record for related in ExampleRelatedModel.select().all()]
+
+    assert len(record) == 1
+    assert record[0].filename == __file__
+
+
+def test_logs_callsite(create_and_wipe_database, caplog, monkeypatch):
+    create_related_records()
+
+    # other tests can leave the activemodel logger disabled, e.g. alembic's logging config
+    monkeypatch.setattr(logger, "disabled", False)
+
+    with (
+        caplog.at_level(logging.WARNING, logger=logger.name),
+        global_session(n_plus_one="log"),
+    ):
+        for related in ExampleRelatedModel.select().all():
+            _ = related.example_record
+
+    assert "N+1 query" in caplog.text
+    assert __file__ in caplog.text
+
+
+def test_eager_loads_and_single_loads_are_not_reported(create_and_wipe_database):
+    create_related_records()
+
+    with global_session(n_plus_one="raise"):
+        related = list(
+            ExampleRelatedModel.select()
+            .options(selectinload(ExampleRelatedModel.example_record))  # type: ignore
+            .all()
+        )
+
+        for instance in related:
+            _ = instance.example_record
+
+    with global_session(n_plus_one="raise"):
+        # each instance comes from its own query
+        for instance_id in [instance.id for instance in related]:
+            _ = ExampleRelatedModel.one(instance_id).example_record
+
+
+def test_threshold(create_and_wipe_database):
+    create_related_records()
+
+    with global_session(n_plus_one=NPlusOneDetector("raise", threshold=3)):
+        related = list(ExampleRelatedModel.select().all())
+        _ = related[0].example_record
+        _ = related[1].example_record
+
+        with pytest.raises(NPlusOneError):
+            _ = related[2].example_record
+
+
+def test_enabled_from_environment(create_and_wipe_database, monkeypatch):
+    create_related_records()
+
+    monkeypatch.setenv("ACTIVEMODEL_N_PLUS_ONE", "raise")
+
+    with global_session():
+        related = list(ExampleRelatedModel.select().all())
+        _ = related[0].example_record
+
+        with pytest.raises(NPlusOneError):
+            _ = related[1].example_record
+
+    # detection is removed from the session when the block exits
+    monkeypatch.delenv("ACTIVEMODEL_N_PLUS_ONE")
+
+    with global_session():
+        for instance in ExampleRelatedModel.select().all():
+            _ = instance.example_record
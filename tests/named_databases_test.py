@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Field
+
+import activemodel
+from activemodel import BaseModel
+from activemodel.session_manager import SessionManager, global_session
+from tests.models import ExampleRecord
+from tests.utils import database_url
+
+
+class EventRecord(BaseModel, table=True):
+    __database__ = "events"
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+
+
+@pytest.fixture
+def events_database(create_and_wipe_database):
+    # the test suite only has one database, a second engine for it is enough to verify routing
+    manager = activemodel.init(database_url(), name="events")
+
+    try:
+        yield manager
+    finally:
+        SessionManager._named_instances.pop("events")
+        manager.get_engine().dispose()
+
+
+def capture_statements(engine) -> list[str]:
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    return statements
+
+
+def test_models_use_their_database(events_database):
+    events_statements = capture_statements(events_database.get_engine())
+    default_statements = capture_statements(activemodel.get_engine())
+
+    with global_session():
+        EventRecord(name="signup").save()
+        ExampleRecord(something="default").save()
+
+        assert EventRecord.get(name="signup") is not None
+        assert EventRecord.select().count() == 1
+        assert ExampleRecord.count() == 1
+
+    assert events_statements
+    assert all("event_record" in statement for statement in events_statements)
+    assert not any("event_record" in statement for statement in default_statements)
+
+
+def test_unknown_database_requires_url():
+    with pytest.raises(AssertionError, match="initialization of 'missing'"):
+        SessionManager.get_instance(name="missing")
+
+
+def test_concurrent_get_engine_creates_one_engine():
+    manager = SessionManager(database_url())
+    barrier = threading.Barrier(8)
+    engines = []
+
+    def get_engine():
+        barrier.wait()
+        engines.append(manager.get_engine())
+
+    threads = [threading.Thread(target=get_engine) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len({id(engine) for engine in engines}) == 1
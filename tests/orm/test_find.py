@@ -0,0 +1,80 @@
+import pytest
+import sqlalchemy.exc
+
+from activemodel.session_manager import global_session
+from tests.lifecycle._helpers import AfterFindModel, events
+from tests.models import ExampleRecord
+from tests.utils import capture_sql
+
+
+def test_find_by_id_and_string(create_and_wipe_database):
+    record = ExampleRecord(something="found").save()
+
+    assert ExampleRecord.find(record.id).something == "found"
+    assert ExampleRecord.find(str(record.id)).id == record.id
+
+
+def test_find_raises_when_missing(create_and_wipe_database):
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        ExampleRecord.find("test_record_01h45ytscbebyvny4gc8cr8ma2")
+
+
+def test_find_uses_identity_map(create_and_wipe_database):
+    record = ExampleRecord(something="cached").save()
+
+    with global_session():
+        loaded = ExampleRecord.find(record.id)
+
+        with capture_sql() as statements:
+            assert ExampleRecord.find(str(record.id)) is loaded
+
+        assert statements == []
+
+
+def test_find_many_preserves_input_order(create_and_wipe_database):
+    records = ExampleRecord.insert_all([{"something": str(i)} for i in range(5)])
+    ids = [records[3].id, records[0].id, str(records[4].id), records[3].id]
+
+    found = ExampleRecord.find_many(ids)
+
+    assert [record.something for record in found] == ["3", "0", "4", "3"]
+
+
+def test_find_many_only_queries_misses_in_batches(create_and_wipe_database):
+    records = ExampleRecord.insert_all([{"something": str(i)} for i in range(5)])
+
+    with global_session():
+        # the identity map is weak-referencing, so hold onto the loaded record
+        loaded = ExampleRecord.find(records[0].id)
+
+        with capture_sql() as statements:
+            found = ExampleRecord.find_many(
+                [record.id for record in records], batch_size=2
+            )
+
+    assert [record.id for record in found] == [record.id for record in records]
+    assert found[0] is loaded
+    assert len(statements) == 2
+    assert all(" IN " in statement for statement in statements)
+
+
+def test_find_many_missing_ids(create_and_wipe_database):
+    record = ExampleRecord(something="exists").save()
+    missing_id = "test_record_01h45ytscbebyvny4gc8cr8ma2"
+
+    found = ExampleRecord.find_many([missing_id, record.id])
+    assert [r.id for r in found] == [record.id]
+
+    with pytest.raises(sqlalchemy.exc.NoResultFound, match="not found"):
+        ExampleRecord.find_many([missing_id, record.id], raise_on_missing=True)
+
+
+def test_find_many_runs_load_hooks(create_and_wipe_database):
+    AfterFindModel.insert_all([{"name": "a"}, {"name": "b"}])
+    ids = [record.id for record in AfterFindModel.select().all()]
+    events.clear()
+
+    found = AfterFindModel.find_many(ids)
+
+    assert [record.found_name for record in found] == ["found:a", "found:b"]
+    assert events == ["after_find:a", "after_find:b"]
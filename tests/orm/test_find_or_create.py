@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from typeid import TypeID
+
+import activemodel
+from tests.lifecycle._helpers import LifecycleModel, events
+from tests.models import EXAMPLE_TABLE_PREFIX, ExampleRecord, UpsertTestModel
+
+
+def test_creates_with_a_single_insert(create_and_wipe_database):
+    with activemodel.query_log() as log:
+        record = UpsertTestModel.find_or_create_by(name="new", category="a")
+
+    assert [entry.sql.split()[0] for entry in log.entries] == ["INSERT"]
+    assert not record.is_new()
+    assert record.value == 0
+    assert UpsertTestModel.one(name="new").id == record.id
+
+
+def test_finds_existing_record_on_conflict(create_and_wipe_database):
+    existing = UpsertTestModel(name="existing", category="a").save()
+
+    with activemodel.query_log() as log:
+        found = UpsertTestModel.find_or_create_by(name="existing", category="a")
+
+    assert found.id == existing.id
+    assert [entry.sql.split()[0] for entry in log.entries] == ["INSERT", "SELECT"]
+
+    # looked up by the unique columns, the other args are only used to create the record
+    assert (
+        UpsertTestModel.find_or_create_by(name="existing", category="b").id
+        == existing.id
+    )
+    assert UpsertTestModel.count() == 1
+
+
+def test_populates_server_defaults(create_and_wipe_database):
+    record = ExampleRecord.find_or_create_by(another_with_index="key")
+
+    assert record.created_at is not None
+    assert ExampleRecord.find_or_create_by(another_with_index="key").id == record.id
+
+
+def test_conflicts_on_other_unique_columns_raise(create_and_wipe_database):
+    existing = ExampleRecord.find_or_create_by(another_with_index="taken")
+
+    # the insert targets the primary key, the unique index on another_with_index is not swallowed
+    with pytest.raises(IntegrityError):
+        ExampleRecord.find_or_create_by(
+            id=TypeID(EXAMPLE_TABLE_PREFIX), another_with_index="taken"
+        )
+
+    assert (
+        ExampleRecord.find_or_create_by(id=existing.id, another_with_index="other").id
+        == existing.id
+    )
+
+
+def test_runs_create_hooks_only_when_created(create_and_wipe_database):
+    events.clear()
+
+    created = LifecycleModel.find_or_create_by(id=1, name="hooked")
+
+    assert created.name == "hooked"
+    assert events == [
+        "before_create",
+        "before_save",
+        "around_save_before",
+        "around_save_after",
+        "after_create",
+        "after_save",
+    ]
+
+    events.clear()
+
+    assert LifecycleModel.find_or_create_by(id=1, name="other").name == "hooked"
+    assert "after_create" not in events
+
+
+def test_without_unique_columns_falls_back_to_find_then_save(create_and_wipe_database):
+    first = LifecycleModel.find_or_create_by(name="plain")
+
+    assert LifecycleModel.find_or_create_by(name="plain").id == first.id
+    assert LifecycleModel.count() == 1
+
+
+def test_find_or_create_all(create_and_wipe_database):
+    existing = UpsertTestModel(name="existing", category="a").save()
+
+    rows = [
+        {"name": "first", "category": "a"},
+        {"name": "existing", "category": "a"},
+        {"name": "second", "category": "b", "value": 5},
+        {"name": "first", "category": "a"},
+    ]
+
+    with activemodel.query_log() as log:
+        records = UpsertTestModel.find_or_create_all(rows, unique_by="name")
+
+    assert [record.name for record in records] == [
+        "first",
+        "existing",
+        "second",
+        "first",
+    ]
+    assert records[0] is records[3]
+    assert records[1].id == existing.id
+    assert records[2].value == 5
+    assert UpsertTestModel.count() == 3
+
+    # one INSERT for the new rows, one SELECT for the existing ones
+    assert [entry.sql.split()[0] for entry in log.entries] == ["INSERT", "SELECT"]
+
+    again = UpsertTestModel.find_or_create_all(
+        rows, unique_by=["name", "category"], batch_size=2
+    )
+    assert [record.id for record in again] == [record.id for record in records]
+
+
+def test_find_or_create_all_requires_unique_columns(create_and_wipe_database):
+    with pytest.raises(ValueError, match="no unique constraint on category"):
+        UpsertTestModel.find_or_create_all([{"category": "a"}], unique_by="category")
@@ -0,0 +1,53 @@
+import pytest
+import sqlalchemy.exc
+
+from tests.models import ExampleRecord
+
+
+def test_keyword_filters_reuse_statement():
+    first, first_params = ExampleRecord._filter_statement((), {"something": "a"})
+    second, second_params = ExampleRecord._filter_statement((), {"something": "b"})
+
+    assert first is second
+    assert first_params == {"filter_something": "a"}
+    assert second_params == {"filter_something": "b"}
+
+
+def test_field_order_does_not_matter():
+    first, _ = ExampleRecord._filter_statement((), {"something": "a", "id": "x"})
+    second, _ = ExampleRecord._filter_statement((), {"id": "x", "something": "a"})
+
+    assert first is second
+
+
+def test_none_and_expressions_build_fresh_statements():
+    cached, _ = ExampleRecord._filter_statement((), {"something": "a"})
+    with_none, params = ExampleRecord._filter_statement((), {"something": None})
+    with_args, _ = ExampleRecord._filter_statement(
+        (ExampleRecord.something == "a",), {}
+    )
+
+    assert with_none is not cached
+    assert params is None
+    assert with_args is not cached
+
+
+def test_cached_finders_return_correct_records(create_and_wipe_database):
+    first = ExampleRecord(something="first").save()
+    ExampleRecord(something="second", another_with_index="indexed").save()
+
+    by_filter = ExampleRecord.get(something="first")
+    assert by_filter is not None and by_filter.id == first.id
+
+    by_id = ExampleRecord.get(str(first.id))
+    assert by_id is not None and by_id.id == first.id
+
+    assert ExampleRecord.one(something="first").id == first.id
+    assert ExampleRecord.one_or_none(something="missing") is None
+
+    by_null = ExampleRecord.get(another_with_index=None)
+    assert by_null is not None and by_null.id == first.id
+    assert ExampleRecord.count() == 2
+
+    with pytest.raises(sqlalchemy.exc.NoResultFound):
+        ExampleRecord.one(something="missing")
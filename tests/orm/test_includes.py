@@ -0,0 +1,137 @@
+import pytest
+from sqlmodel import Field, Relationship
+
+import activemodel
+from activemodel import BaseModel
+from activemodel.session_manager import global_session
+
+
+class IncludesAuthor(BaseModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+
+    posts: list["IncludesPost"] = Relationship(back_populates="author")
+
+
+class IncludesPost(BaseModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    title: str
+    author_id: int = Field(foreign_key="includes_author.id")
+
+    author: IncludesAuthor = Relationship(back_populates="posts")
+    comments: list["IncludesComment"] = Relationship(back_populates="post")
+
+
+class IncludesComment(BaseModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    body: str
+    post_id: int = Field(foreign_key="includes_post.id")
+
+    post: IncludesPost = Relationship(back_populates="comments")
+
+
+@pytest.fixture
+def posts(create_and_wipe_database):
+    with global_session():
+        for author_index in range(2):
+            author = IncludesAuthor(name=f"author {author_index}").save()
+            assert author.id is not None
+
+            for post_index in range(2):
+                post = IncludesPost(
+                    title=f"post {post_index}", author_id=author.id
+                ).save()
+                assert post.id is not None
+
+                for comment_index in range(3):
+                    IncludesComment(
+                        body=f"comment {comment_index}", post_id=post.id
+                    ).save()
+
+
+def load_everything(query) -> tuple[list[IncludesPost], int]:
+    "load the posts and touch every relationship, returns the posts and the number of statements executed"
+
+    with global_session(n_plus_one="raise"), activemodel.query_log() as log:
+        posts = list(query.all())
+
+        for post in posts:
+            _ = post.author.name
+
+            for comment in post.comments:
+                _ = comment.post.title
+
+    return posts, log.count
+
+
+def test_includes_joins_to_one_and_preloads_collections(posts):
+    posts, statements = load_everything(
+        IncludesPost.select().includes("author", "comments.post")
+    )
+
+    assert len(posts) == 4
+    assert sum(len(post.comments) for post in posts) == 12
+    # posts joined with authors, then comments
+    assert statements == 2
+
+
+def test_preload_uses_separate_queries(posts):
+    _, statements = load_everything(IncludesPost.select().preload("author", "comments"))
+
+    # posts, authors, comments
+    assert statements == 3
+
+
+def test_eager_load_collections_are_uniqued(posts):
+    posts, statements = load_everything(
+        IncludesPost.select().eager_load("author", "comments")
+    )
+
+    assert len(posts) == 4
+    assert statements == 1
+
+    with global_session():
+        post = (
+            IncludesPost.select()
+            .eager_load("comments")
+            .where(IncludesPost.title == "post 0")
+            .first()
+        )
+
+        assert post is not None
+        assert len(post.comments) == 3
+
+
+def test_nested_paths_from_collections(posts):
+    with global_session():
+        author = IncludesAuthor.select().includes("posts.comments").first()
+
+        assert author is not None
+        assert "posts" in author.__dict__
+        assert all("comments" in post.__dict__ for post in author.posts)
+
+
+def test_sampling_keeps_loader_options(posts):
+    with global_session(), activemodel.query_log() as log:
+        sampled = (
+            IncludesPost.select()
+            .includes("author", "comments")
+            .sample(2, strategy="system")
+        )
+
+        assert len(sampled) == 2
+        assert all("author" in post.__dict__ for post in sampled)
+        assert all("comments" in post.__dict__ for post in sampled)
+
+    assert any("TABLESAMPLE" in entry.sql for entry in log.entries)
+
+
+def test_unknown_relationships_raise(posts):
+    with pytest.raises(ValueError, match="IncludesPost has no relationship 'editor'"):
+        IncludesPost.select().includes("editor")
+
+    with pytest.raises(ValueError, match="IncludesComment has no relationship 'tags'"):
+        IncludesPost.select().preload("comments.tags")
+
+    with pytest.raises(ValueError, match="no relationship 'title'"):
+        IncludesPost.select().eager_load("title")
@@ -0,0 +1,64 @@
+import pytest
+from whenever import ZonedDateTime
+
+from tests.lifecycle._helpers import LifecycleModel, events
+from tests.models import ExampleRecord
+from tests.utils import capture_sql
+
+
+def test_insert_all_from_dicts_and_instances(create_and_wipe_database):
+    records = ExampleRecord.insert_all(
+        [{"something": "first"}, ExampleRecord(something="second")]
+    )
+
+    assert [record.something for record in records] == ["first", "second"]
+    assert all(record.id is not None for record in records)
+    assert ExampleRecord.count() == 2
+    assert ExampleRecord.one(records[0].id).something == "first"
+
+
+def test_insert_all_populates_server_defaults_without_refresh(
+    create_and_wipe_database,
+):
+    with capture_sql() as statements:
+        records = ExampleRecord.insert_all(
+            [{"something": str(i)} for i in range(10)], batch_size=5
+        )
+
+        # accessing server defaults must not trigger a lazy refresh
+        assert all(isinstance(record.created_at, ZonedDateTime) for record in records)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+
+    assert selects == []
+    assert len(inserts) == 2
+    assert all("RETURNING" in statement for statement in inserts)
+
+
+def test_insert_all_runs_create_hooks(create_and_wipe_database):
+    events.clear()
+
+    LifecycleModel.insert_all([{"name": "one"}, {"name": "two"}])
+
+    assert events == [
+        "before_create",
+        "before_save",
+        "before_create",
+        "before_save",
+        "around_save_before",
+        "around_save_before",
+        "around_save_after",
+        "around_save_after",
+        "after_create",
+        "after_save",
+        "after_create",
+        "after_save",
+    ]
+
+
+def test_insert_all_rejects_persisted_records(create_and_wipe_database):
+    record = ExampleRecord(something="saved").save()
+
+    with pytest.raises(ValueError, match="not persisted"):
+        ExampleRecord.insert_all([record])
@@ -0,0 +1,117 @@
+import activemodel
+from activemodel.session_manager import global_session
+from tests.lifecycle._helpers import DeleteModel, LifecycleModel, events
+from tests.models import CachedPlan, ExampleRecord
+
+
+def create_records() -> list[ExampleRecord]:
+    return ExampleRecord.insert_all(
+        [{"something": "a"}, {"something": "a"}, {"something": "b"}]
+    )
+
+
+def test_update_all_issues_a_single_update(create_and_wipe_database):
+    create_records()
+
+    with activemodel.query_log() as log:
+        updated = ExampleRecord.where(ExampleRecord.something == "a").update_all(
+            something="c"
+        )
+
+    assert updated == 2
+    assert [entry.sql.split()[0] for entry in log.entries] == ["UPDATE"]
+    assert sorted(ExampleRecord.select().pluck("something")) == ["b", "c", "c"]
+
+
+def test_update_all_returning(create_and_wipe_database):
+    records = create_records()
+
+    updated = ExampleRecord.where(ExampleRecord.something == "b").update_all(
+        something="d", returning=True
+    )
+
+    assert [record.id for record in updated] == [records[2].id]
+    assert updated[0].something == "d"
+
+
+def test_update_all_synchronizes_loaded_records(create_and_wipe_database):
+    create_records()
+
+    with global_session():
+        loaded = ExampleRecord.where(ExampleRecord.something == "b").one()
+
+        ExampleRecord.where(ExampleRecord.something == "b").update_all(
+            something="synced"
+        )
+        assert loaded.something == "synced"
+
+        ExampleRecord.where(ExampleRecord.id == loaded.id).update_all(
+            something="stale", synchronize_session=False
+        )
+        assert loaded.something == "synced"
+
+
+def test_update_all_with_limit_matches_primary_keys(create_and_wipe_database):
+    create_records()
+
+    updated = (
+        ExampleRecord.where(ExampleRecord.something == "a")
+        .order_by(ExampleRecord.id)
+        .limit(1)
+        .update_all(something="limited")
+    )
+
+    assert updated == 1
+    assert sorted(ExampleRecord.select().pluck("something")) == ["a", "b", "limited"]
+
+
+def test_update_all_run_hooks(create_and_wipe_database):
+    LifecycleModel.insert_all([{"name": "one"}, {"name": "two"}])
+    events.clear()
+
+    assert LifecycleModel.select().update_all(name="renamed", run_hooks=True) == 2
+
+    assert events.count("before_update") == 2
+    assert events.count("after_save") == 2
+    assert LifecycleModel.select().pluck("name") == ["renamed", "renamed"]
+
+
+def test_update_all_invalidates_cache(create_and_wipe_database):
+    plan = CachedPlan(name="v1").save()
+    CachedPlan.find(plan.id)
+
+    CachedPlan.where(CachedPlan.id == plan.id).update_all(name="v2")
+
+    assert CachedPlan.find(plan.id).name == "v2"
+
+
+def test_delete_all(create_and_wipe_database):
+    records = create_records()
+
+    with activemodel.query_log() as log:
+        deleted = ExampleRecord.where(ExampleRecord.something == "a").delete_all()
+
+    assert deleted == 2
+    assert log.count == 1
+    assert ExampleRecord.select().ids() == [records[2].id]
+
+    (returned,) = ExampleRecord.select().delete_all(returning=True)
+    assert returned.id == records[2].id
+    assert ExampleRecord.count() == 0
+
+
+def test_delete(create_and_wipe_database):
+    create_records()
+
+    assert ExampleRecord.where(ExampleRecord.something == "b").delete() == 1
+    assert ExampleRecord.count() == 2
+
+
+def test_delete_all_run_hooks(create_and_wipe_database):
+    DeleteModel.insert_all([{}, {}])
+    events.clear()
+
+    assert DeleteModel.select().delete_all(run_hooks=True) == 2
+    assert events.count("before_delete") == 2
+    assert events.count("after_delete") == 2
+    assert DeleteModel.count() == 0
@@ -0,0 +1,85 @@
+from tests.models import ExampleRecord, UpsertTestModel
+from tests.utils import capture_sql
+
+
+def test_upsert_all_inserts_and_updates(create_and_wipe_database):
+    existing = UpsertTestModel.upsert(
+        data={"name": "existing", "category": "A", "value": 1},
+        unique_by="name",
+    )
+
+    rows = [
+        {"name": "new1", "category": "B", "value": 10},
+        {"name": "existing", "category": "C", "value": 20},
+        {"name": "new2", "category": "D", "value": 30},
+    ]
+
+    results = {
+        result.name: result
+        for result in UpsertTestModel.upsert_all(rows, unique_by="name")
+    }
+
+    assert set(results) == {"new1", "existing", "new2"}
+    assert results["existing"].id == existing.id
+    assert results["existing"].category == "C"
+    assert results["existing"].value == 20
+    assert UpsertTestModel.count() == 3
+
+
+def test_upsert_all_batches_into_single_statements(create_and_wipe_database):
+    rows = [{"name": f"row{i}", "category": "A", "value": i} for i in range(10)]
+
+    with capture_sql() as statements:
+        results = UpsertTestModel.upsert_all(rows, unique_by="name", batch_size=4)
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+
+    assert len(results) == 10
+    assert len(inserts) == 3
+    assert all("ON CONFLICT" in statement for statement in inserts)
+
+
+def test_upsert_all_limits_update_columns(create_and_wipe_database):
+    UpsertTestModel.upsert_all(
+        [{"name": "limited", "category": "A", "value": 1}], unique_by="name"
+    )
+
+    (result,) = UpsertTestModel.upsert_all(
+        [{"name": "limited", "category": "B", "value": 2}],
+        unique_by="name",
+        update_columns=["value"],
+    )
+
+    assert result.value == 2
+    assert result.category == "A"
+
+
+def test_upsert_all_ids_only(create_and_wipe_database):
+    ids = UpsertTestModel.upsert_all(
+        [{"name": "id1", "category": "A"}, {"name": "id2", "category": "A"}],
+        unique_by="name",
+        ids_only=True,
+    )
+
+    assert {UpsertTestModel.one(id).name for id in ids} == {"id1", "id2"}
+
+
+def test_upsert_all_touches_updated_at(create_and_wipe_database):
+    (record,) = ExampleRecord.upsert_all(
+        [{"another_with_index": "key", "something": "first"}],
+        unique_by="another_with_index",
+    )
+
+    (updated,) = ExampleRecord.upsert_all(
+        [{"another_with_index": "key", "something": "second"}],
+        unique_by="another_with_index",
+    )
+
+    assert updated.id == record.id
+    assert updated.something == "second"
+    assert updated.updated_at is not None and record.updated_at is not None
+    assert updated.updated_at > record.updated_at
+
+
+def test_upsert_all_empty_rows(create_and_wipe_database):
+    assert UpsertTestModel.upsert_all([], unique_by="name") == []
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import text
+
+from activemodel.session_manager import SessionManager
+from tests.utils import database_url
+
+
+@pytest.fixture
+def manager():
+    manager = SessionManager(database_url())
+
+    try:
+        yield manager
+    finally:
+        manager.get_engine().dispose()
+
+
+def test_checkouts_and_gauges(manager):
+    engine = manager.get_engine()
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    with engine.connect():
+        stats = manager.stats()
+
+        assert stats["checked_out"] == 1
+        assert stats["pool_size"] == 5
+
+    stats = manager.stats()
+
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 4
+    assert stats["connections_opened"] == 1
+    assert stats["checkout_wait_ms"]["count"] == 4
+    assert sum(stats["checkout_wait_ms"]["buckets"].values()) == 4
+    assert stats["connection_age_seconds"]["max"] > 0
+
+
+def test_pre_ping_failures_and_invalidations(manager):
+    engine = manager.get_engine()
+
+    with engine.connect() as connection:
+        pid = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+
+    # kill the pooled connection from another connection so the next checkout fails its pre-ping
+    admin_engine = SessionManager(database_url()).get_engine()
+
+    with admin_engine.connect() as admin:
+        admin.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    admin_engine.dispose()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    stats = manager.stats()
+
+    assert stats["pre_ping_failures"] == 1
+    assert stats["invalidations"] >= 1
+    assert stats["connections_opened"] == 2
@@ -0,0 +1,80 @@
+import pytest
+
+import activemodel
+from activemodel.query_log import fingerprint
+from tests.models import ExampleRecord
+
+
+def test_records_statements_with_callers(create_and_wipe_database):
+    with activemodel.query_log() as log:
+        record = ExampleRecord(something="logged").save()
+        ExampleRecord.get(something="logged")
+        list(ExampleRecord.select().all())
+
+    callers = [entry.caller for entry in log.entries]
+
+    assert log.count == len(log.entries) > 0
+    assert "BaseModel.save" in callers
+    assert "BaseModel.get" in callers
+    assert "QueryWrapper.all" in callers
+
+    get_entry = log.entries[callers.index("BaseModel.get")]
+    assert get_entry.rows == 1
+    assert get_entry.params_count == 1
+    assert get_entry.duration > 0
+    assert log.duration >= get_entry.duration
+
+    assert record.id is not None
+
+
+def test_aggregates_by_fingerprint(create_and_wipe_database):
+    with activemodel.query_log() as log:
+        for name in ["a", "b", "c"]:
+            ExampleRecord.get(something=name)
+
+    totals = log.by_fingerprint()
+
+    assert len(totals) == 1
+    assert next(iter(totals.values()))["count"] == 3
+    assert next(iter(totals.values()))["callers"] == {"BaseModel.get"}
+
+
+def test_nested_logs_and_scope(create_and_wipe_database):
+    ExampleRecord.count()
+
+    with activemodel.query_log() as outer:
+        ExampleRecord.count()
+
+        with activemodel.query_log() as inner:
+            ExampleRecord.count()
+
+    ExampleRecord.count()
+
+    assert outer.count == 2
+    assert inner.count == 1
+
+
+def test_sampled_out_logs_record_nothing(create_and_wipe_database):
+    with activemodel.query_log(sample_rate=0) as log:
+        ExampleRecord.count()
+
+    assert not log.sampled
+    assert log.count == 0
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (
+            "SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)",
+            "SELECT * FROM t WHERE id IN (%(id_1)s)",
+        ),
+        (
+            "INSERT INTO t (a) VALUES (%(a_0)s), (%(a_1)s)",
+            "INSERT INTO t (a) VALUES (%(a_0)s)",
+        ),
+        ("SELECT * FROM t LIMIT 1", "SELECT  *  FROM t\nLIMIT 10"),
+    ],
+)
+def test_fingerprint_normalizes_values(first, second):
+    assert fingerprint(first) == fingerprint(second)
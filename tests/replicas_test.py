@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import event
+
+import activemodel
+from activemodel.replicas import Replica, RoutingSession, choose_replica
+from activemodel.session_manager import SessionManager, global_session
+from tests.models import ExampleRecord
+from tests.utils import database_url
+
+UNREACHABLE_URL = "postgresql+psycopg://root@127.0.0.1:1/development"
+
+
+@pytest.fixture
+def replica_manager(create_and_wipe_database):
+    "swap in a session manager whose replica is the test database itself"
+
+    primary_manager = SessionManager.get_instance()
+    manager = SessionManager(
+        database_url(), replicas=[database_url()], replica_sticky_window=0
+    )
+    SessionManager._instance = manager
+
+    try:
+        yield manager
+    finally:
+        SessionManager._instance = primary_manager
+        manager.get_engine().dispose()
+
+        for replica in manager.replicas:
+            replica.get_engine().dispose()
+
+
+def capture_statements(engine) -> list[str]:
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    return statements
+
+
+def test_reads_go_to_replica_and_writes_to_primary(replica_manager):
+    primary = capture_statements(replica_manager.get_engine())
+    replica = capture_statements(replica_manager.replicas[0].get_engine())
+
+    record = ExampleRecord(something="routed").save()
+    assert ExampleRecord.get(record.id) is not None
+    assert ExampleRecord.select().count() == 1
+
+    assert "INSERT" in primary
+    assert replica == ["SELECT", "SELECT"]
+
+
+def test_global_session_sticks_to_primary_after_write(replica_manager):
+    replica = capture_statements(replica_manager.replicas[0].get_engine())
+
+    with global_session():
+        ExampleRecord.count()
+        assert replica == ["SELECT"]
+
+        ExampleRecord(something="sticky").save()
+        assert ExampleRecord.get(something="sticky") is not None
+
+    assert replica == ["SELECT"]
+
+
+def test_transaction_reads_from_primary(replica_manager):
+    record = ExampleRecord(something="before").save()
+    replica = capture_statements(replica_manager.replicas[0].get_engine())
+
+    with activemodel.transaction():
+        loaded = ExampleRecord.get(record.id)
+        assert loaded is not None
+
+        loaded.something = "after"
+        loaded.save()
+
+    assert replica == []
+
+
+def test_sticky_window_keeps_new_sessions_on_primary(replica_manager):
+    replica_manager.replica_sticky_window = 60
+    replica = capture_statements(replica_manager.replicas[0].get_engine())
+
+    ExampleRecord(something="window").save()
+    assert ExampleRecord.get(something="window") is not None
+
+    assert replica == []
+
+
+def test_estimates_read_from_replica(replica_manager):
+    replica = capture_statements(replica_manager.replicas[0].get_engine())
+
+    with global_session() as session:
+        ExampleRecord.count(estimate=True)
+        ExampleRecord.select().sample(strategy="system")
+
+        assert isinstance(session, RoutingSession)
+        assert not session._pinned_to_primary
+
+    assert replica and set(replica) == {"SELECT"}
+
+
+def test_unhealthy_replica_is_skipped(replica_manager):
+    replica_manager.replicas.append(
+        Replica(UNREACHABLE_URL, weight=1, engine_options={}, retry_interval=60)
+    )
+
+    assert replica_manager.check_replicas() == {
+        database_url(): True,
+        UNREACHABLE_URL: False,
+    }
+
+    for _ in range(5):
+        assert ExampleRecord.count() == 0
+
+
+def test_weighted_selection():
+    options = {"engine_options": {}, "retry_interval": 60}
+    weighted = Replica("weighted", weight=1, **options)
+    disabled = Replica("disabled", weight=0, **options)
+
+    assert {choose_replica([weighted, disabled]) for _ in range(20)} == {weighted}
+
+    weighted.mark_unhealthy()
+    assert choose_replica([weighted, disabled]) is None
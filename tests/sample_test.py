@@ -0,0 +1,157 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import NoResultFound
+
+import activemodel
+from activemodel import query_wrapper
+from activemodel.query_log import QueryLog
+from activemodel.session_manager import get_engine, global_session
+from tests.lifecycle._helpers import AfterInitializeModel
+from tests.models import ExampleRecord
+
+
+@pytest.fixture
+def records(create_and_wipe_database) -> list[ExampleRecord]:
+    ExampleRecord.insert_all(
+        [{"something": "b" if i % 10 == 0 else "a"} for i in range(300)]
+    )
+
+    with global_session() as session:
+        session.execute(text(f"ANALYZE {ExampleRecord.__tablename__}"))
+        session.commit()
+
+    return list(ExampleRecord.select().all())
+
+
+def executed_statements(log: QueryLog) -> str:
+    return "\n".join(entry.sql for entry in log.entries)
+
+
+@pytest.mark.parametrize("strategy", ["system", "bernoulli"])
+def test_tablesample(records, strategy):
+    with activemodel.query_log() as log:
+        sampled = ExampleRecord.select().sample(5, strategy=strategy)
+
+    assert len({record.id for record in sampled}) == 5
+    assert {record.id for record in sampled} <= {record.id for record in records}
+    assert "TABLESAMPLE" in executed_statements(log)
+
+
+def test_tablesample_samples_part_of_the_table(records, monkeypatch):
+    percentages: list[float] = []
+
+    def capture_percent(conn, cursor, statement, parameters, context, executemany):
+        if "TABLESAMPLE" in statement:
+            percentages.extend(
+                value for value in parameters.values() if isinstance(value, float)
+            )
+
+    def fail_reservoir(*args, **kwargs):
+        raise AssertionError("fell back to the reservoir strategy")
+
+    monkeypatch.setattr(query_wrapper.QueryWrapper, "_sample_reservoir", fail_reservoir)
+    event.listen(get_engine(), "before_cursor_execute", capture_percent)
+
+    try:
+        sampled = ExampleRecord.select().sample(5, strategy="bernoulli")
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", capture_percent)
+
+    assert len(sampled) == 5
+    assert 0 < percentages[0] < 100
+
+
+def test_tablesample_percent_selects_several_pages():
+    # 1M rows over 16k pages, one row would be 0.001% of the table
+    percent = query_wrapper._tablesample_percent(1, "system", 1_000_000, 16_000)
+    assert percent / 100 * 16_000 == pytest.approx(query_wrapper.TABLESAMPLE_MIN_PAGES)
+
+    percent = query_wrapper._tablesample_percent(1_000, "system", 1_000_000, 16_000)
+    assert percent == pytest.approx(1.0)
+
+    assert query_wrapper._tablesample_percent(1, "bernoulli", 1_000_000, 16_000) == (
+        pytest.approx(0.001)
+    )
+    assert query_wrapper._tablesample_percent(5, "system", 100, 2) == 100.0
+    assert query_wrapper._tablesample_percent(5, "system", 0, 0) == 100.0
+
+
+def test_tablesample_requires_unfiltered_query(records):
+    with pytest.raises(ValueError, match="TABLESAMPLE"):
+        ExampleRecord.where(ExampleRecord.something == "b").sample(strategy="system")
+
+
+def test_key_probing(records):
+    sampled = ExampleRecord.where(ExampleRecord.something == "b").sample(
+        5, strategy="key"
+    )
+
+    assert 0 < len(sampled) <= 5
+    assert len({record.id for record in sampled}) == len(sampled)
+    assert all(record.something == "b" for record in sampled)
+
+
+def test_key_probing_integer_keys(create_and_wipe_database):
+    AfterInitializeModel.insert_all([{"name": str(i)} for i in range(20)])
+
+    sampled = AfterInitializeModel.select().sample(strategy="key")
+
+    assert isinstance(sampled, AfterInitializeModel)
+    assert AfterInitializeModel.select().sample(20, strategy="key")
+
+
+def test_key_probing_empty(create_and_wipe_database):
+    assert ExampleRecord.select().sample(3, strategy="key") == []
+
+
+def test_reservoir(records):
+    matching = {
+        record.id for record in records if record.something == "b"
+    }  # 30 records
+
+    sampled = ExampleRecord.where(ExampleRecord.something == "b").sample(
+        5, strategy="reservoir"
+    )
+
+    assert len(sampled) == 5
+    assert {record.id for record in sampled} <= matching
+
+    everything = ExampleRecord.where(ExampleRecord.something == "b").sample(
+        50, strategy="reservoir"
+    )
+
+    assert {record.id for record in everything} == matching
+
+
+def test_auto_strategy(records, monkeypatch):
+    with activemodel.query_log() as log:
+        ExampleRecord.select().sample(3)
+
+    assert "random()" in executed_statements(log)
+
+    monkeypatch.setattr(query_wrapper, "SORT_SAMPLE_MAX_ROWS", 100)
+
+    with activemodel.query_log() as log:
+        ExampleRecord.select().sample(3)
+
+    assert "TABLESAMPLE" in executed_statements(log)
+
+    with activemodel.query_log() as log:
+        sampled = ExampleRecord.where(ExampleRecord.something == "b").sample(3)
+
+    assert "random()" not in executed_statements(log)
+    assert all(record.something == "b" for record in sampled)
+
+
+def test_unknown_strategy(create_and_wipe_database):
+    with pytest.raises(ValueError, match="Unknown sample strategy"):
+        ExampleRecord.select().sample(strategy="shuffle")  # type: ignore[arg-type]
+
+
+def test_model_sample_raises_when_empty(create_and_wipe_database):
+    with pytest.raises(NoResultFound):
+        ExampleRecord.sample()
+
+    record = ExampleRecord().save()
+
+    assert ExampleRecord.sample() == record
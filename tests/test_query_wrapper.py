@@ -1,13 +1,21 @@
+from dataclasses import dataclass
 from typing import Any, Generator, assert_type
 import uuid
 
+import pytest
 import sqlmodel as sm
+from pydantic import BaseModel as PydanticBaseModel
 from sqlmodel.sql.expression import SelectOfScalar
-from sqlalchemy import column
+from sqlalchemy import column, event
 
+from activemodel import get_engine
 from activemodel.query_wrapper import QueryWrapper
 from activemodel.session_manager import global_session
+from tests.lifecycle._helpers import AfterInitializeModel, events
 from tests.models import ExampleRecord, UpsertTestModel
+from tests.pydantic_json.helpers import ExampleWithSimpleJSON, SubObject
+from tests.utils import capture_sql
+from typeid import TypeID
 
 
 def test_basic_types(create_and_wipe_database):
@@ -211,3 +219,193 @@ def test_first_last_do_not_mutate_query(create_and_wipe_database):
     _ = q.last()
     # underlying query should remain identical
     assert q.sql() == before_sql
+
+
+def test_in_batches_pages_by_primary_key(create_and_wipe_database):
+    records = ExampleRecord.insert_all([{"something": str(i)} for i in range(7)])
+
+    with capture_sql() as statements:
+        batches = list(ExampleRecord.select().in_batches(batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [r.id for batch in batches for r in batch] == sorted(r.id for r in records)
+
+    # keyset pagination, no OFFSET
+    assert len(statements) == 3
+    assert all("OFFSET" not in statement for statement in statements)
+
+
+def test_find_each_respects_filters(create_and_wipe_database):
+    ExampleRecord.insert_all(
+        [{"something": "keep"} for _ in range(5)]
+        + [{"something": "skip"} for _ in range(5)]
+    )
+
+    found = list(
+        ExampleRecord.where(ExampleRecord.something == "keep")
+        .order_by(sm.desc(ExampleRecord.created_at))
+        .find_each(batch_size=2)
+    )
+
+    assert len(found) == 5
+    assert all(record.something == "keep" for record in found)
+
+
+def test_find_each_expunges_batches_from_global_session(create_and_wipe_database):
+    ExampleRecord.insert_all([{"something": str(i)} for i in range(5)])
+
+    with global_session() as session:
+        for record in ExampleRecord.select().find_each(batch_size=2):
+            assert record in session
+
+        assert len(session.identity_map) == 0
+
+
+def test_find_each_runs_load_hooks(create_and_wipe_database):
+    AfterInitializeModel.insert_all([{"name": "a"}, {"name": "b"}])
+    events.clear()
+
+    loaded = list(AfterInitializeModel.select().find_each(batch_size=1))
+
+    assert [record.initialized_name for record in loaded] == [
+        "initialized:a",
+        "initialized:b",
+    ]
+    assert events == [
+        "after_find:a",
+        "after_initialize:a",
+        "after_find:b",
+        "after_initialize:b",
+    ]
+
+
+def test_stream_uses_server_side_cursor(create_and_wipe_database):
+    ExampleRecord.insert_all([{"something": str(i)} for i in range(5)])
+
+    stream_options = []
+
+    def _record_options(conn, cursor, statement, parameters, context, executemany):
+        stream_options.append(context.execution_options.get("stream_results"))
+
+    event.listen(get_engine(), "before_cursor_execute", _record_options)
+
+    try:
+        streamed = list(ExampleRecord.select().stream(yield_per=2))
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", _record_options)
+
+    assert len(streamed) == 5
+    assert stream_options == [True]
+
+
+def test_stream_expunges_instances(create_and_wipe_database):
+    ExampleRecord.insert_all([{"something": str(i)} for i in range(3)])
+
+    with global_session() as session:
+        for record in ExampleRecord.select().stream(yield_per=2, expunge=True):
+            assert record in session
+
+        assert len(session.identity_map) == 0
+
+
+def test_stream_rehydrates_pydantic_json(create_and_wipe_database):
+    ExampleWithSimpleJSON(object_field=SubObject(name="streamed", value=1)).save()
+
+    (record,) = ExampleWithSimpleJSON.select().stream(yield_per=1)
+
+    assert isinstance(record.object_field, SubObject)
+    assert record.object_field.name == "streamed"
+
+
+def test_pluck_returns_values_without_hydrating(create_and_wipe_database):
+    AfterInitializeModel.insert_all([{"name": "a"}, {"name": "b"}, {"name": "c"}])
+    events.clear()
+
+    query = AfterInitializeModel.where(AfterInitializeModel.name != "c").order_by(
+        AfterInitializeModel.name
+    )
+
+    with global_session() as session:
+        assert query.pluck("name") == ["a", "b"]
+
+        pairs = query.pluck("id", "name")
+        assert [name for _, name in pairs] == ["a", "b"]
+        assert all(isinstance(pair, tuple) for pair in pairs)
+
+        assert sorted(AfterInitializeModel.select().ids()) == sorted(
+            id for id, _ in AfterInitializeModel.select().pluck("id", "name")
+        )
+        assert query.pluck(sm.func.upper(AfterInitializeModel.name)) == ["A", "B"]
+
+        assert len(session.identity_map) == 0
+
+    assert events == []
+
+
+def test_pluck_unknown_column(create_and_wipe_database):
+    with pytest.raises(ValueError, match="has no column 'missing'"):
+        ExampleRecord.select().pluck("missing")
+
+
+class ExampleRecordSchema(PydanticBaseModel):
+    id: TypeID
+    something: str | None
+    label: str = "default"
+
+
+@dataclass(slots=True)
+class ExampleRecordRow:
+    id: TypeID
+    something: str | None
+
+
+def test_as_loads_schemas_without_hydrating(create_and_wipe_database):
+    record = ExampleRecord(something="projected").save()
+
+    statements = []
+
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with global_session() as session:
+        event.listen(get_engine(), "before_cursor_execute", _record_statement)
+
+        try:
+            (schema,) = ExampleRecord.where(ExampleRecord.id == record.id).as_(
+                ExampleRecordSchema
+            )
+        finally:
+            event.remove(get_engine(), "before_cursor_execute", _record_statement)
+
+        (row,) = ExampleRecord.select().as_(ExampleRecordRow)
+        (constructed,) = ExampleRecord.select().as_(ExampleRecordSchema, validate=False)
+
+        assert len(session.identity_map) == 0
+
+    assert schema == ExampleRecordSchema(id=record.id, something="projected")
+    assert isinstance(schema.id, TypeID)
+    assert row == ExampleRecordRow(id=record.id, something="projected")
+    assert constructed.label == "default"
+
+    # only the schema's columns are selected
+    assert "created_at" not in statements[0]
+
+
+def test_as_rehydrates_json_columns(create_and_wipe_database):
+    class JSONSchema(PydanticBaseModel):
+        object_field: SubObject
+
+    ExampleWithSimpleJSON(object_field=SubObject(name="projected", value=1)).save()
+
+    (schema,) = ExampleWithSimpleJSON.select().as_(JSONSchema)
+
+    assert schema.object_field == SubObject(name="projected", value=1)
+
+
+def test_as_requires_columns_for_required_fields(create_and_wipe_database):
+    class MissingColumnSchema(PydanticBaseModel):
+        id: TypeID
+        missing: str
+
+    with pytest.raises(ValueError, match="has no column 'missing'"):
+        ExampleRecord.select().as_(MissingColumnSchema)
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+import activemodel
+from activemodel import get_engine
+from tests.lifecycle._helpers import AfterCommitModel, events
+from tests.models import AnotherExample, ExampleRecord
+
+
+@contextmanager
+def count_commits():
+    commits: list[object] = []
+
+    def _record_commit(conn):
+        commits.append(conn)
+
+    event.listen(get_engine(), "commit", _record_commit)
+
+    try:
+        yield commits
+    finally:
+        event.remove(get_engine(), "commit", _record_commit)
+
+
+def test_transaction_commits_once(create_and_wipe_database):
+    with count_commits() as commits, activemodel.transaction():
+        first = ExampleRecord(something="first").save()
+        second = AnotherExample(note="second").save()
+        first.something = "updated"
+        first.save()
+
+        assert commits == []
+
+    assert len(commits) == 1
+    assert ExampleRecord.one(first.id).something == "updated"
+    assert AnotherExample.one(second.id).note == "second"
+
+    # instances stay usable after the block exits
+    assert first.created_at is not None
+
+
+def test_transaction_rolls_back_on_error(create_and_wipe_database):
+    with pytest.raises(ValueError), activemodel.transaction():
+        ExampleRecord(something="rolled back").save()
+        raise ValueError("boom")
+
+    assert ExampleRecord.count() == 0
+
+
+def test_nested_transaction_rolls_back_to_savepoint(create_and_wipe_database):
+    with activemodel.transaction():
+        outer = ExampleRecord(something="outer").save()
+
+        with pytest.raises(ValueError), activemodel.transaction():
+            ExampleRecord(something="inner").save()
+            raise ValueError("boom")
+
+    assert ExampleRecord.count() == 1
+    assert ExampleRecord.one().id == outer.id
+
+
+def test_delete_inside_transaction(create_and_wipe_database):
+    record = ExampleRecord(something="to delete").save()
+
+    with activemodel.transaction():
+        record.delete()
+        assert ExampleRecord.count() == 0
+
+    assert ExampleRecord.count() == 0
+
+
+def test_after_commit_deferred_until_outermost_commit(create_and_wipe_database):
+    events.clear()
+
+    with activemodel.transaction():
+        AfterCommitModel(name="outer").save()
+
+        with activemodel.transaction():
+            AfterCommitModel(name="inner").save()
+
+        with pytest.raises(ValueError), activemodel.transaction():
+            AfterCommitModel(name="rolled back").save()
+            raise ValueError("boom")
+
+        assert "after_commit:outer" not in events
+
+    assert events == [
+        "after_save:outer",
+        "after_save:inner",
+        "after_save:rolled back",
+        "after_commit:outer",
+        "after_commit:inner",
+    ]
+
+
+def test_after_commit_dropped_on_rollback(create_and_wipe_database):
+    events.clear()
+
+    with pytest.raises(ValueError), activemodel.transaction():
+        AfterCommitModel(name="never").save()
+        raise ValueError("boom")
+
+    assert events == ["after_save:never"]
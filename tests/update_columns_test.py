@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy.exc import NoResultFound
+
+import activemodel
+from activemodel.session_manager import global_session
+from tests.lifecycle._helpers import LifecycleModel, events
+from tests.models import CachedPlan, ExampleRecord
+
+
+def test_update_columns_issues_a_single_update(create_and_wipe_database):
+    record = ExampleRecord(something="a", another_with_index="x").save()
+
+    with activemodel.query_log() as log:
+        assert record.update_columns(something="b") is record
+
+    assert [entry.sql.split()[0] for entry in log.entries] == ["UPDATE"]
+    assert record.something == "b"
+    assert ExampleRecord.find(record.id).something == "b"
+    assert ExampleRecord.find(record.id).another_with_index == "x"
+
+
+def test_update_columns_leaves_instance_clean(create_and_wipe_database):
+    with global_session() as session:
+        record = ExampleRecord(something="a").save()
+        record.update_columns(something="b")
+
+        assert record not in session.dirty
+        assert not record.modified_fields()
+
+
+def test_update_columns_returning(create_and_wipe_database):
+    record = ExampleRecord(something="a").save()
+    updated_at = record.updated_at
+
+    record.update_columns(something="b", returning=True)
+
+    assert record.something == "b"
+    assert record.updated_at is not None and updated_at is not None
+    assert record.updated_at > updated_at
+    assert ExampleRecord.find(record.id).updated_at == record.updated_at
+
+
+def test_update_columns_skips_hooks(create_and_wipe_database):
+    record = LifecycleModel(name="one").save()
+    events.clear()
+
+    record.update_columns(name="two")
+
+    assert events == []
+    assert LifecycleModel.find(record.id).name == "two"
+
+
+def test_update_columns_validation(create_and_wipe_database):
+    with pytest.raises(ValueError, match="persisted record"):
+        ExampleRecord(something="a").update_columns(something="b")
+
+    record = ExampleRecord(something="a").save()
+
+    with pytest.raises(ValueError, match="has no column"):
+        record.update_columns(unknown="b")
+
+    ExampleRecord.where(ExampleRecord.id == record.id).delete()
+
+    with pytest.raises(NoResultFound):
+        record.update_columns(something="b")
+
+
+def test_update_by_id(create_and_wipe_database):
+    record = ExampleRecord(something="a").save()
+
+    with activemodel.query_log() as log:
+        assert ExampleRecord.update_by_id(record.id, something="b") is True
+
+    assert log.count == 1
+    assert ExampleRecord.find(record.id).something == "b"
+
+    updated = ExampleRecord.update_by_id(record.id, something="c", returning=True)
+    assert isinstance(updated, ExampleRecord) and updated.something == "c"
+
+    ExampleRecord.where(ExampleRecord.id == record.id).delete()
+
+    assert ExampleRecord.update_by_id(record.id, something="d") is False
+    assert ExampleRecord.update_by_id(record.id, something="d", returning=True) is None
+
+
+def test_update_columns_invalidates_cache(create_and_wipe_database):
+    plan = CachedPlan(name="v1").save()
+    CachedPlan.find(plan.id)
+
+    plan.update_columns(name="v2")
+    assert CachedPlan.find(plan.id).name == "v2"
+
+    CachedPlan.update_by_id(plan.id, name="v3")
+    assert CachedPlan.find(plan.id).name == "v3"
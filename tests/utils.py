@@ -1,7 +1,7 @@
 import os
 from contextlib import contextmanager
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 
 from activemodel import get_engine
 from sqlmodel import SQLModel
@@ -41,3 +41,21 @@ def temporary_tables():
         yield
     finally:
         drop_all_tables()
+
+
+@contextmanager
+def capture_sql():
+    "collect every SQL statement sent to the database, helpful for asserting on round trips"
+
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _capture)
+
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)